@@ -12,10 +12,14 @@ This script integrates with our multi-omics approach:
 Open-Meteo provides FREE access to professional-grade ECMWF reanalysis data.
 """
 
+import asyncio
+import httpx
+import orjson
 import polars as pl
-import requests
 import time
 import json
+import gzip
+import hashlib
 import logging
 from datetime import datetime, timedelta
 import os
@@ -30,6 +34,55 @@ logger = logging.getLogger(__name__)
 
 # Open-Meteo API Configuration
 OPENMETEO_BASE_URL = "https://archive-api.open-meteo.com/v1/archive"
+OPENMETEO_TIMEZONE = "Africa/Nairobi"
+OPENMETEO_TIME_FORMAT = "%Y-%m-%dT%H:%M"  # Local ISO timestamps, e.g. 2019-01-01T00:00
+
+OPENMETEO_HEADERS = {"User-Agent": "agri-adapt/1.0", "Accept-Encoding": "gzip"}
+
+# Hourly Open-Meteo variables consumed downstream, mapped to our column names
+HOURLY_VARIABLE_COLUMNS = {
+    'temperature_2m': 'Temperature_C',
+    'relative_humidity_2m': 'Humidity_Percent',
+    'pressure_msl': 'Pressure_hPa',
+    'et0_fao_evapotranspiration': 'Evapotranspiration_mm',
+    'precipitation': 'Precipitation_mm'
+}
+
+# Water Stress Index parameters (FAO AQUASTAT-based, constrained to the 0.73-0.86 arid range)
+WSI_MIN = 0.73                    # Base stress for arid regions
+WSI_MAX = 0.86                    # Maximum stress (also used when there is no rainfall)
+WSI_TEMP_OPTIMUM_C = 25.0         # 0.06 per degree above optimal growing temperature
+WSI_TEMP_SLOPE = 0.06
+WSI_TEMP_CAP = 0.3
+WSI_EVAP_THRESHOLD_MM = 5.0       # 0.06 per mm of evapotranspiration above 5mm
+WSI_EVAP_SLOPE = 0.06
+WSI_EVAP_CAP = 0.3
+WSI_RAINFALL_THRESHOLD_MM = 50.0  # 0.008 per mm of rainfall below 50mm
+WSI_RAINFALL_SLOPE = 0.008
+WSI_HUMIDITY_THRESHOLD_PCT = 60.0 # 0.002 per % of humidity below 60%
+WSI_HUMIDITY_SLOPE = 0.002
+WSI_INPUT_COLUMNS = ['Temperature_C', 'Evapotranspiration_mm', 'Precipitation_mm', 'Humidity_Percent']
+
+# Concurrency settings - HTTP/2 multiplexes all county requests over a few connections
+MAX_CONNECTIONS = 10
+MAX_REQUESTS_PER_SECOND = 5  # Stay well inside Open-Meteo's free-tier quota
+
+# Retry policy for rate-limit and transient server errors
+MAX_RETRIES = 5
+RETRY_BACKOFF_FACTOR = 1.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Output locations for per-county and combined weather data
+WEATHER_DATA_DIR = "data/weather_data"
+MONTHLY_WEATHER_PARQUET = f"{WEATHER_DATA_DIR}/monthly.parquet"
+
+# On-disk response cache - archive (reanalysis) data is static, so entries never expire
+CACHE_DIR = "data/.openmeteo_cache"
+
+# Statuses returned when a date range is too long for a single archive request
+PAYLOAD_TOO_LARGE_STATUSES = (413, 414)
+
+_next_request_time = 0.0
 
 # County coordinates (approximate centroids for the 20 counties in our dataset)
 COUNTY_COORDINATES = {
@@ -55,7 +108,103 @@ COUNTY_COORDINATES = {
     'West Pokot': (1.4000, 35.1000)
 }
 
-def get_historical_weather_data(lat: float, lon: float, start_date: str, end_date: str) -> Optional[Dict]:
+# Hourly weather record schema. Float32 is ample for 3-4 significant figures of
+# weather data, and County is an Enum over the fixed county list so that
+# per-county Parquet files concatenate without re-encoding.
+WEATHER_SCHEMA = {
+    'County': pl.Enum(list(COUNTY_COORDINATES)),
+    'Date': pl.Utf8,
+    'Time': pl.Utf8,
+    'Year': pl.Int16,
+    'Month': pl.Int8,
+    'Day': pl.Int8,
+    'Hour': pl.Int8,
+    'Latitude': pl.Float32,
+    'Longitude': pl.Float32,
+    'Temperature_C': pl.Float32,
+    'Humidity_Percent': pl.Float32,
+    'Pressure_hPa': pl.Float32,
+    'Evapotranspiration_mm': pl.Float32,
+    'Precipitation_mm': pl.Float32,
+    'Water_Stress_Index': pl.Float32,
+    'Irrigation_Needed': pl.UInt8,
+    'Irrigation_Volume_Liters_Ha': pl.Int16,
+    'Crop_Yield_Impact_Percent': pl.Int8,
+    'Heat_Stress_Days': pl.Int8
+}
+
+def _cache_path(params: Dict) -> str:
+    """
+    Cache file path for a request, keyed by a hash of its parameters
+    """
+    key = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json.gz")
+
+def _load_cached_response(params: Dict) -> Optional[Dict]:
+    """
+    Return a previously cached API response, if any
+    """
+    path = _cache_path(params)
+    if not os.path.exists(path):
+        return None
+    try:
+        with gzip.open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+        return None
+
+def _save_cached_response(params: Dict, data: Dict) -> None:
+    """
+    Write an API response to the cache (atomically, so concurrent workers never see partial files)
+    """
+    path = _cache_path(params)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not cache response to {path}: {e}")
+
+def _new_client() -> httpx.AsyncClient:
+    """
+    HTTP/2 client shared by all Open-Meteo requests in a collection run
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS),
+        headers=OPENMETEO_HEADERS
+    )
+
+async def _wait_for_rate_limit() -> None:
+    """
+    Wait until the next request slot is available (shared by all pending requests)
+    """
+    global _next_request_time
+    now = time.monotonic()
+    wait = _next_request_time - now
+    _next_request_time = max(now, _next_request_time) + 1.0 / MAX_REQUESTS_PER_SECOND
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying - the server's Retry-After when given,
+    otherwise exponential backoff. Successful requests never wait.
+    """
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass  # HTTP-date form - fall back to exponential backoff
+    return RETRY_BACKOFF_FACTOR * 2 ** attempt
+
+async def fetch_historical_weather_data(client: httpx.AsyncClient, lat: float, lon: float,
+                                        start_date: str, end_date: str) -> Optional[Dict]:
     """
     Get historical weather data from Open-Meteo API
     """
@@ -65,53 +214,29 @@ def get_historical_weather_data(lat: float, lon: float, start_date: str, end_dat
             "longitude": lon,
             "start_date": start_date,
             "end_date": end_date,
-            "hourly": [
-                "temperature_2m",
-                "relative_humidity_2m", 
-                "dewpoint_2m",
-                "apparent_temperature",
-                "precipitation",
-                "rain",
-                "snowfall",
-                "weather_code",
-                "pressure_msl",
-                "surface_pressure",
-                "cloud_cover",
-                "et0_fao_evapotranspiration",
-                "vapour_pressure_deficit",
-                "wind_speed_10m",
-                "wind_direction_10m",
-                "wind_gusts_10m"
-            ],
-            "daily": [
-                "weather_code",
-                "temperature_2m_max",
-                "temperature_2m_min", 
-                "temperature_2m_mean",
-                "apparent_temperature_max",
-                "apparent_temperature_min",
-                "apparent_temperature_mean",
-                "sunrise",
-                "sunset",
-                "daylight_duration",
-                "sunshine_duration",
-                "precipitation_sum",
-                "rain_sum",
-                "snowfall_sum",
-                "precipitation_hours",
-                "wind_speed_10m_max",
-                "wind_gusts_10m_max",
-                "wind_direction_10m_dominant",
-                "shortwave_radiation_sum",
-                "et0_fao_evapotranspiration"
-            ],
-            "timezone": "Africa/Nairobi"
+            # Only the hourly variables consumed by process_weather_response
+            "hourly": list(HOURLY_VARIABLE_COLUMNS),
+            "timezone": OPENMETEO_TIMEZONE
         }
         
-        response = requests.get(OPENMETEO_BASE_URL, params=params, timeout=30)
+        cached = _load_cached_response(params)
+        if cached is not None:
+            return cached
+        
+        for attempt in range(MAX_RETRIES + 1):
+            await _wait_for_rate_limit()
+            response = await client.get(OPENMETEO_BASE_URL, params=params)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            await asyncio.sleep(_retry_delay(response, attempt))
         
         if response.status_code == 200:
-            return response.json()
+            data = orjson.loads(response.content)
+            _save_cached_response(params, data)
+            return data
+        elif response.status_code in PAYLOAD_TOO_LARGE_STATUSES:
+            logger.warning(f"Range {start_date}..{end_date} too large ({response.status_code}), splitting")
+            return await _fetch_split_range_weather_data(client, lat, lon, start_date, end_date)
         else:
             logger.error(f"API call failed: {response.status_code} - {response.text}")
             return None
@@ -120,41 +245,56 @@ def get_historical_weather_data(lat: float, lon: float, start_date: str, end_dat
         logger.error(f"Error fetching data: {e}")
         return None
 
+async def _fetch_split_range_weather_data(client: httpx.AsyncClient, lat: float, lon: float,
+                                          start_date: str, end_date: str) -> Optional[Dict]:
+    """
+    Fetch a date range as two halves and stitch the hourly arrays back together
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    if start >= end:
+        return None
+    
+    mid = start + (end - start) / 2
+    first, second = await asyncio.gather(
+        fetch_historical_weather_data(client, lat, lon, start_date, mid.strftime("%Y-%m-%d")),
+        fetch_historical_weather_data(client, lat, lon, (mid + timedelta(days=1)).strftime("%Y-%m-%d"), end_date)
+    )
+    if first is None or second is None:
+        return None
+    
+    merged = dict(first)
+    if 'hourly' in first and 'hourly' in second:
+        merged['hourly'] = {key: first['hourly'][key] + second['hourly'].get(key, []) for key in first['hourly']}
+    return merged
+
+def get_historical_weather_data(lat: float, lon: float, start_date: str, end_date: str) -> Optional[Dict]:
+    """
+    Get historical weather data from Open-Meteo API (synchronous, single request)
+    """
+    async def _fetch() -> Optional[Dict]:
+        async with _new_client() as client:
+            return await fetch_historical_weather_data(client, lat, lon, start_date, end_date)
+    
+    return asyncio.run(_fetch())
+
 def calculate_water_stress_index(temp: float, evap: float, rainfall: float, humidity: float) -> float:
     """
     Calculate Water Stress Index following FAO AQUASTAT methodology
     Ranges from 0.0-1.0, with higher values indicating severe water scarcity
     """
     if rainfall <= 0:
-        return 0.86  # Maximum stress if no rainfall (arid region baseline)
-    
-    # Temperature factor (0.0-0.3 contribution)
-    temp_factor = 0.0
-    if temp > 25:  # Above optimal growing temperature
-        temp_factor = min(0.3, (temp - 25) * 0.06)  # 0.06 per degree above 25°C
-    
-    # Evapotranspiration factor (0.0-0.3 contribution)
-    evap_factor = 0.0
-    if evap > 5:  # High evapotranspiration
-        evap_factor = min(0.3, (evap - 5) * 0.06)  # 0.06 per mm above 5mm
-    
-    # Rainfall factor (0.0-0.4 contribution)
-    rainfall_factor = 0.0
-    if rainfall < 50:  # Low rainfall
-        rainfall_factor = (50 - rainfall) * 0.008  # 0.008 per mm below 50mm
-    
-    # Humidity factor (0.0-0.1 contribution)
-    humidity_factor = 0.0
-    if humidity < 60:  # Low humidity
-        humidity_factor = (60 - humidity) * 0.002  # 0.002 per % below 60%
+        return WSI_MAX  # Maximum stress if no rainfall (arid region baseline)
     
-    # Base stress for arid regions (0.73-0.86 range as per requirements)
-    base_stress = 0.73
+    total_stress = (
+        WSI_MIN
+        + max(0.0, min(WSI_TEMP_CAP, (temp - WSI_TEMP_OPTIMUM_C) * WSI_TEMP_SLOPE))
+        + max(0.0, min(WSI_EVAP_CAP, (evap - WSI_EVAP_THRESHOLD_MM) * WSI_EVAP_SLOPE))
+        + max(0.0, (WSI_RAINFALL_THRESHOLD_MM - rainfall) * WSI_RAINFALL_SLOPE)
+        + max(0.0, (WSI_HUMIDITY_THRESHOLD_PCT - humidity) * WSI_HUMIDITY_SLOPE)
+    )
     
-    # Calculate total stress index
-    total_stress = base_stress + temp_factor + evap_factor + rainfall_factor + humidity_factor
-    
-    return max(0.73, min(0.86, total_stress))  # Constrain to required range
+    return max(WSI_MIN, min(WSI_MAX, total_stress))  # Constrain to required range
 
 def calculate_irrigation_needs(rainfall: float, water_stress: float, temp: float) -> Dict:
     """
@@ -193,165 +333,279 @@ def calculate_heat_stress_days(temp: float, threshold: float = 30.0) -> int:
     """
     return 1 if temp > threshold else 0
 
-def process_weather_response(response_data: Dict, county: str, lat: float, lon: float) -> List[Dict]:
+def irrigation_needed_label() -> pl.Expr:
     """
-    Process Open-Meteo API response into structured data
+    Map the encoded Irrigation_Needed flag back to its Yes/No/Unknown CSV label
+    """
+    flag = pl.col('Irrigation_Needed')
+    return (
+        pl.when(flag == 1).then(pl.lit('Yes'))
+        .when(flag == 0).then(pl.lit('No'))
+        .otherwise(pl.lit('Unknown'))
+        .alias('Irrigation_Needed')
+    )
+
+def process_weather_response(response_data: Dict, county: str, lat: float, lon: float) -> pl.DataFrame:
     """
-    weather_data = []
+    Process Open-Meteo API response into structured data
     
-    if 'hourly' not in response_data or 'daily' not in response_data:
+    All derived columns (water stress, irrigation needs, heat stress) are built as
+    Polars expressions over the hourly arrays, mirroring the scalar calculate_* helpers.
+    """
+    if 'hourly' not in response_data:
         logger.error(f"Invalid response format for {county}")
-        return weather_data
+        return pl.DataFrame(schema=WEATHER_SCHEMA)
     
     hourly = response_data['hourly']
-    daily = response_data['daily']
-    
-    # Get time arrays
     hourly_times = hourly.get('time', [])
-    daily_times = daily.get('time', [])
-    
-    # Get weather variables
-    temp_2m = hourly.get('temperature_2m', [])
-    humidity = hourly.get('relative_humidity_2m', [])
-    pressure = hourly.get('pressure_msl', [])
-    evap = hourly.get('et0_fao_evapotranspiration', [])
-    precipitation = hourly.get('precipitation', [])
-    
-    # Process hourly data
-    for i, time_str in enumerate(hourly_times):
-        try:
-            dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            
-            # Get values (handle missing data)
-            temp = temp_2m[i] if i < len(temp_2m) else None
-            hum = humidity[i] if i < len(humidity) else None
-            pres = pressure[i] if i < len(pressure) else None
-            evap_val = evap[i] if i < len(evap) else None
-            precip = precipitation[i] if i < len(precipitation) else None
-            
-            # Calculate water stress index
-            if all(v is not None for v in [temp, evap_val, precip, hum]):
-                # Type assertion: we know these are not None at this point
-                temp_val = float(temp)  # type: ignore
-                evap_val_float = float(evap_val)  # type: ignore
-                precip_val = float(precip)  # type: ignore
-                hum_val = float(hum)  # type: ignore
-                water_stress = calculate_water_stress_index(temp_val, evap_val_float, precip_val, hum_val)
-            else:
-                water_stress = None
-            
-            # Calculate irrigation needs and heat stress
-            irrigation_data = {}
-            heat_stress_days = 0
-            
-            if all(v is not None for v in [precip, water_stress, temp]) and water_stress is not None:
-                # Type assertion: we know these are not None at this point
-                precip_val = float(precip)  # type: ignore
-                temp_val = float(temp)  # type: ignore
-                irrigation_data = calculate_irrigation_needs(precip_val, water_stress, temp_val)
-                heat_stress_days = calculate_heat_stress_days(temp_val)
-            
-            weather_data.append({
-                'County': county,
-                'Date': dt.strftime('%Y-%m-%d'),
-                'Time': dt.strftime('%H:%M:%S'),
-                'Year': dt.year,
-                'Month': dt.month,
-                'Day': dt.day,
-                'Hour': dt.hour,
-                'Latitude': lat,
-                'Longitude': lon,
-                'Temperature_C': temp,
-                'Humidity_Percent': hum,
-                'Pressure_hPa': pres,
-                'Evapotranspiration_mm': evap_val,
-                'Precipitation_mm': precip,
-                'Water_Stress_Index': water_stress,
-                'Irrigation_Needed': irrigation_data.get('irrigation_needed', 'Unknown'),
-                'Irrigation_Volume_Liters_Ha': irrigation_data.get('irrigation_volume_liters_ha', 0),
-                'Crop_Yield_Impact_Percent': irrigation_data.get('crop_yield_impact_percent', 0),
-                'Heat_Stress_Days': heat_stress_days
-            })
-            
-        except Exception as e:
-            logger.warning(f"Error processing time {time_str} for {county}: {e}")
-            continue
-    
-    logger.info(f"✅ Processed {len(weather_data)} hourly records for {county}")
-    return weather_data
+    n_hours = len(hourly_times)
+    
+    # Align every variable to the time axis (missing trailing values become null)
+    columns = {'time': hourly_times}
+    for api_name, column in HOURLY_VARIABLE_COLUMNS.items():
+        values = list(hourly.get(api_name, []))[:n_hours]
+        columns[column] = values + [None] * (n_hours - len(values))
+    
+    schema = {'time': pl.Utf8, **{column: pl.Float64 for column in HOURLY_VARIABLE_COLUMNS.values()}}
+    df = pl.DataFrame(columns, schema=schema)
+    
+    temp = pl.col('Temperature_C')
+    hum = pl.col('Humidity_Percent')
+    evap = pl.col('Evapotranspiration_mm')
+    precip = pl.col('Precipitation_mm')
+    
+    # Water Stress Index (see calculate_water_stress_index)
+    # Single null mask over all inputs replaces the per-row all(v is not None ...) checks
+    valid = pl.all_horizontal([pl.col(column).is_not_null() for column in WSI_INPUT_COLUMNS])
+    stress_total = (
+        WSI_MIN
+        + ((temp - WSI_TEMP_OPTIMUM_C) * WSI_TEMP_SLOPE).clip(0.0, WSI_TEMP_CAP)
+        + ((evap - WSI_EVAP_THRESHOLD_MM) * WSI_EVAP_SLOPE).clip(0.0, WSI_EVAP_CAP)
+        + ((WSI_RAINFALL_THRESHOLD_MM - precip) * WSI_RAINFALL_SLOPE).clip(lower_bound=0.0)
+        + ((WSI_HUMIDITY_THRESHOLD_PCT - hum) * WSI_HUMIDITY_SLOPE).clip(lower_bound=0.0)
+    ).clip(WSI_MIN, WSI_MAX)
+    water_stress = (
+        pl.when(~valid).then(pl.lit(None, dtype=pl.Float64))
+        .when(precip <= 0).then(pl.lit(WSI_MAX))
+        .otherwise(stress_total)
+    )
+    
+    df = df.with_columns(
+        # Bulk-parse the whole time axis in Rust with a fixed format (no per-row inference);
+        # cache=True interns each distinct timestamp string so it is parsed only once
+        pl.col('time').str.to_datetime(
+            OPENMETEO_TIME_FORMAT, time_zone=OPENMETEO_TIMEZONE, strict=False, cache=True
+        ).alias('dt'),
+        water_stress.alias('Water_Stress_Index')
+    ).filter(pl.col('dt').is_not_null())
+    
+    # Irrigation needs and heat stress (see calculate_irrigation_needs / calculate_heat_stress_days)
+    ws = pl.col('Water_Stress_Index')
+    needs_irrigation = (precip < 10) & (ws > 0.75)
+    df = df.with_columns(
+        # Encoded as 1=Yes / 0=No / null=Unknown; labelled only when written to CSV
+        pl.when(ws.is_not_null())
+        .then(needs_irrigation.cast(pl.UInt8))
+        .alias('Irrigation_Needed'),
+        pl.when(needs_irrigation & (ws > 0.80)).then(4450)
+        .when(needs_irrigation & (ws > 0.78)).then(4300)
+        .when(needs_irrigation).then(3800)
+        .otherwise(0)
+        .cast(pl.Int64)
+        .alias('Irrigation_Volume_Liters_Ha'),
+        pl.when(needs_irrigation & (ws > 0.80)).then(20)
+        .when(needs_irrigation & (ws > 0.78)).then(15)
+        .when(needs_irrigation).then(10)
+        .otherwise(0)
+        .cast(pl.Int64)
+        .alias('Crop_Yield_Impact_Percent'),
+        pl.when(ws.is_not_null() & (temp > 30.0)).then(1)
+        .otherwise(0)
+        .cast(pl.Int64)
+        .alias('Heat_Stress_Days')
+    )
+    
+    dt = pl.col('dt')
+    weather_df = df.select(
+        # Per-county constants are typed scalar literals broadcast over the frame
+        pl.lit(county, dtype=WEATHER_SCHEMA['County']).alias('County'),
+        # Date/Time strings are slices of the ISO timestamp - no per-row formatting
+        pl.col('time').str.slice(0, 10).alias('Date'),
+        (pl.col('time').str.slice(11, 5) + ':00').alias('Time'),
+        dt.dt.year().alias('Year'),
+        dt.dt.month().alias('Month'),
+        dt.dt.day().alias('Day'),
+        dt.dt.hour().alias('Hour'),
+        pl.lit(lat, dtype=pl.Float32).alias('Latitude'),
+        pl.lit(lon, dtype=pl.Float32).alias('Longitude'),
+        'Temperature_C',
+        'Humidity_Percent',
+        'Pressure_hPa',
+        'Evapotranspiration_mm',
+        'Precipitation_mm',
+        'Water_Stress_Index',
+        'Irrigation_Needed',
+        'Irrigation_Volume_Liters_Ha',
+        'Crop_Yield_Impact_Percent',
+        'Heat_Stress_Days'
+    ).cast(WEATHER_SCHEMA)
+    
+    logger.info(f"✅ Processed {len(weather_df)} hourly records for {county}")
+    return weather_df
+
+async def _fetch_county(client: httpx.AsyncClient,
+                        job: Tuple[str, float, float, int, int]) -> Tuple[str, Optional[Dict]]:
+    """
+    Fetch the full year range for one county in a single request
+    """
+    county, lat, lon, start_year, end_year = job
+    response = await fetch_historical_weather_data(client, lat, lon, f"{start_year}-01-01", f"{end_year}-12-31")
+    return county, response
 
 def collect_county_weather_data(county: str, lat: float, lon: float, 
-                               start_year: int = 2019, end_year: int = 2023) -> List[Dict]:
+                               start_year: int = 2019, end_year: int = 2023) -> pl.DataFrame:
     """
     Collect weather data for a specific county over the specified years
     """
     logger.info(f"🌤️ Collecting real weather data for {county} ({start_year}-{end_year})")
     
-    all_weather_data = []
-    
-    # Collect data year by year to avoid API limits
-    for year in range(start_year, end_year + 1):
-        start_date = f"{year}-01-01"
-        end_date = f"{year}-12-31"
-        
-        logger.info(f"  📅 Collecting {year} data...")
-        
-        # Get weather data for this year
-        weather_response = get_historical_weather_data(lat, lon, start_date, end_date)
-        
-        if weather_response:
-            year_data = process_weather_response(weather_response, county, lat, lon)
-            all_weather_data.extend(year_data)
-            logger.info(f"    ✅ {year}: {len(year_data)} records")
-        else:
-            logger.warning(f"    ⚠️ {year}: Failed to collect data")
-        
-        # Rate limiting - be respectful to the free API
-        time.sleep(1)  # 1 second delay between years
+    weather_response = get_historical_weather_data(lat, lon, f"{start_year}-01-01", f"{end_year}-12-31")
+    if weather_response:
+        all_weather_data = process_weather_response(weather_response, county, lat, lon)
+    else:
+        logger.warning(f"    ⚠️ {county} {start_year}-{end_year}: Failed to collect data")
+        all_weather_data = pl.DataFrame(schema=WEATHER_SCHEMA)
     
     logger.info(f"✅ Total: {len(all_weather_data)} weather records for {county}")
     return all_weather_data
 
-def collect_all_counties_weather_data() -> Optional[pl.DataFrame]:
+def weather_parquet_path(county_slug: str) -> str:
     """
-    Collect weather data for all 20 counties
+    Path of the per-county hourly weather Parquet file
     """
-    all_weather_data = []
-    
-    for county, (lat, lon) in COUNTY_COORDINATES.items():
-        try:
-            county_data = collect_county_weather_data(county, lat, lon)
-            all_weather_data.extend(county_data)
-            
-            # Save county data incrementally
-            county_df = pl.DataFrame(county_data)
-            county_df.write_csv(f"data/weather_data/weather_data_{county.lower().replace(' ', '_')}.csv")
-            
-            logger.info(f"✅ Saved weather data for {county}")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to collect data for {county}: {e}")
-            continue
+    return f"{WEATHER_DATA_DIR}/weather_{county_slug}.parquet"
+
+async def _collect_and_save_counties(jobs: List[Tuple[str, float, float, int, int]]) -> List[str]:
+    """
+    Fetch all counties concurrently and write each to Parquet as its response arrives
+    """
+    saved_counties = []
+    
+    async with _new_client() as client:
+        for next_result in asyncio.as_completed([_fetch_county(client, job) for job in jobs]):
+            county, weather_response = await next_result
+            try:
+                if not weather_response:
+                    logger.error(f"❌ Failed to collect data for {county}")
+                    continue
+                
+                lat, lon = COUNTY_COORDINATES[county]
+                county_df = process_weather_response(weather_response, county, lat, lon)
+                if county_df.is_empty():
+                    logger.error(f"❌ No usable records for {county}")
+                    continue
+                
+                # Save county data incrementally (Parquet only - CSVs are exported at the end)
+                county_slug = county.lower().replace(' ', '_')
+                county_df.write_parquet(
+                    weather_parquet_path(county_slug),
+                    compression="zstd",
+                    statistics=True
+                )
+                saved_counties.append(county_slug)
+                
+                logger.info(f"✅ Saved weather data for {county}")
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to save data for {county}: {e}")
+                continue
+    
+    return saved_counties
+
+def collect_all_counties_weather_data(start_year: int = 2019, end_year: int = 2023) -> Optional[pl.LazyFrame]:
+    """
+    Collect weather data for all 20 counties
     
-    # Create combined dataset
-    if len(all_weather_data) > 0:
-        weather_df = pl.DataFrame(all_weather_data)
-        
-        # Save combined dataset
-        weather_df.write_csv("data/weather_data/kenya_counties_weather_2019-2023.csv")
-        logger.info(f"✅ Saved combined weather dataset: {len(weather_df)} records")
+    Each county is written to Parquet as soon as it arrives, so hourly records are never
+    accumulated in memory; the combined dataset is returned as a lazy scan over those files.
+    """
+    # One multi-year job per county, multiplexed over a shared HTTP/2 client
+    jobs = [
+        (county, lat, lon, start_year, end_year)
+        for county, (lat, lon) in COUNTY_COORDINATES.items()
+    ]
+    logger.info(f"🚀 Fetching {len(jobs)} counties ({start_year}-{end_year}) over HTTP/2")
+    
+    saved_counties = asyncio.run(_collect_and_save_counties(jobs))
+    
+    # Create combined dataset from the counties saved in this run only, so Parquet files
+    # left over from earlier runs (possibly other year ranges) are never mixed in
+    if saved_counties:
+        weather_lf = pl.scan_parquet([weather_parquet_path(slug) for slug in saved_counties])
+        export_weather_csv_files(saved_counties)
+        logger.info(f"✅ Saved combined weather dataset for {len(saved_counties)} counties")
         
-        return weather_df
+        return weather_lf
     else:
         logger.error("❌ No weather data collected")
         return None
 
-def create_water_scarcity_dashboard_data(weather_df: pl.DataFrame) -> None:
+def export_weather_csv_files(county_slugs: List[str]) -> None:
+    """
+    Stream the per-county and combined CSV artifacts from the Parquet files
+    
+    The per-county CSVs are read by create_water_scarcity_data.py and
+    integrate_all_datasets.py, so they are still produced, but via sink_csv
+    rather than from frames held in memory.
+    """
+    for county_slug in county_slugs:
+        pl.scan_parquet(weather_parquet_path(county_slug)).with_columns(
+            irrigation_needed_label()
+        ).sink_csv(f"{WEATHER_DATA_DIR}/weather_data_{county_slug}.csv")
+    
+    pl.scan_parquet([weather_parquet_path(slug) for slug in county_slugs]).with_columns(
+        irrigation_needed_label()
+    ).sink_csv(f"{WEATHER_DATA_DIR}/kenya_counties_weather_2019-2023.csv")
+
+def _monthly_agg_lf(weather_lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Lazy plan aggregating hourly weather records to monthly values per county
+    """
+    return weather_lf.group_by([
+        pl.col("County"),
+        pl.col("Year"),
+        pl.col("Month")
+    ]).agg([
+        pl.col("Temperature_C").mean().alias("Temperature_C"),
+        pl.col("Humidity_Percent").mean().alias("Humidity_Percent"),
+        pl.col("Precipitation_mm").sum().alias("Monthly_Rainfall_mm"),
+        pl.col("Evapotranspiration_mm").sum().alias("Monthly_Evapotranspiration_mm"),
+        pl.col("Water_Stress_Index").mean().alias("Water_Stress_Index"),
+        # Majority vote over the 0/1 flag - a single numeric reduction, no string hashing
+        (pl.col("Irrigation_Needed").mean() > 0.5).cast(pl.UInt8).alias("Irrigation_Needed"),
+        pl.col("Irrigation_Volume_Liters_Ha").mean().alias("Irrigation_Volume_Liters_Ha"),
+        pl.col("Crop_Yield_Impact_Percent").mean().alias("Crop_Yield_Impact_Percent"),
+        pl.col("Heat_Stress_Days").sum().alias("Monthly_Heat_Stress_Days")
+    ]).with_columns([
+        # Add date column for easier integration
+        pl.datetime(pl.col("Year"), pl.col("Month"), 1).alias("Date")
+    ])
+
+def aggregate_monthly_weather(weather_lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Stream the monthly aggregation of the hourly data to Parquet (the hourly
+    frame is never materialized) and return a lazy scan of the monthly file
+    """
+    logger.info("📊 Aggregating hourly data to monthly...")
+    _monthly_agg_lf(weather_lf).sink_parquet(MONTHLY_WEATHER_PARQUET)
+    return pl.scan_parquet(MONTHLY_WEATHER_PARQUET)
+
+def create_water_scarcity_dashboard_data(monthly_agg: pl.LazyFrame) -> None:
     """
     Create Water Scarcity Dashboard datasets with exact column specifications
     All datasets are monthly aggregated for better integration with other datasets
     """
-    if weather_df is None:
+    if monthly_agg is None:
         logger.error("❌ Cannot create dashboard data - no weather data")
         return
     
@@ -359,82 +613,45 @@ def create_water_scarcity_dashboard_data(weather_df: pl.DataFrame) -> None:
     logger.info("=" * 70)
     
     try:
-        # First, aggregate all hourly data to monthly for consistency
-        logger.info("📊 Aggregating hourly data to monthly...")
-        
-        monthly_agg = weather_df.group_by([
-            pl.col("County"),
-            pl.col("Year"),
-            pl.col("Month")
-        ]).agg([
-            pl.col("Temperature_C").mean().alias("Temperature_C"),
-            pl.col("Humidity_Percent").mean().alias("Humidity_Percent"),
-            pl.col("Precipitation_mm").sum().alias("Monthly_Rainfall_mm"),
-            pl.col("Evapotranspiration_mm").sum().alias("Monthly_Evapotranspiration_mm"),
-            pl.col("Water_Stress_Index").mean().alias("Water_Stress_Index"),
-            pl.col("Irrigation_Needed").mode().alias("Irrigation_Needed"),
-            pl.col("Irrigation_Volume_Liters_Ha").mean().alias("Irrigation_Volume_Liters_Ha"),
-            pl.col("Crop_Yield_Impact_Percent").mean().alias("Crop_Yield_Impact_Percent"),
-            pl.col("Heat_Stress_Days").sum().alias("Monthly_Heat_Stress_Days")
-        ]).lazy()
-        
-        # Add date column for easier integration
-        monthly_agg = monthly_agg.with_columns([
-            pl.datetime(pl.col("Year"), pl.col("Month"), 1).alias("Date")
-        ])
-        
         # 1. WATER STRESS INDEX DATASET
         logger.info("📊 Creating Water Stress Index Dataset...")
-        water_stress_data = monthly_agg.select([
+        water_stress_lf = monthly_agg.select([
             pl.col("Date"),
             pl.col("Water_Stress_Index"),
             pl.col("County").alias("Region"),
-            pl.col("Water_Stress_Index").map_elements(
-                lambda x: 345 - (x - 0.73) * 200 if x is not None else 345
-            ).alias("Water_Availability_m3_person"),
-            pl.col("Water_Stress_Index").map_elements(
-                lambda x: x * 30 + 15 if x is not None else 15
-            ).alias("Crop_Loss_Risk_Percent")
-        ]).collect()
-        
-        # Save Water Stress Index dataset
-        water_stress_data.write_csv("data/weather_data/water_stress_index_data.csv")
-        logger.info(f"✅ Water Stress Index Dataset: {len(water_stress_data)} monthly records")
-        logger.info(f"   Columns: Date, Water_Stress_Index, Region, Water_Availability_m3_person, Crop_Loss_Risk_Percent")
+            pl.when(pl.col("Water_Stress_Index").is_null())
+            .then(345.0)
+            .otherwise(345 - (pl.col("Water_Stress_Index") - 0.73) * 200)
+            .alias("Water_Availability_m3_person"),
+            pl.when(pl.col("Water_Stress_Index").is_null())
+            .then(15.0)
+            .otherwise(pl.col("Water_Stress_Index") * 30 + 15)
+            .alias("Crop_Loss_Risk_Percent")
+        ])
         
         # 2. IRRIGATION NEED DATASET
         logger.info("💧 Creating Irrigation Need Dataset...")
-        irrigation_data = monthly_agg.select([
+        irrigation_lf = monthly_agg.select([
             pl.col("Monthly_Rainfall_mm").alias("Rainfall_mm"),
             pl.col("Water_Stress_Index"),
-            pl.col("Irrigation_Needed"),
+            irrigation_needed_label(),
             pl.col("Irrigation_Volume_Liters_Ha"),
             pl.col("Crop_Yield_Impact_Percent")
-        ]).collect()
-        
-        # Save Irrigation Need dataset
-        irrigation_data.write_csv("data/weather_data/irrigation_need_data.csv")
-        logger.info(f"✅ Irrigation Need Dataset: {len(irrigation_data)} monthly records")
-        logger.info(f"   Columns: Rainfall_mm, Water_Stress_Index, Irrigation_Needed, Irrigation_Volume_Liters_Ha, Crop_Yield_Impact_Percent")
+        ])
         
         # 3. TEMPERATURE DATASET
         logger.info("🌡️ Creating Temperature Dataset...")
-        temperature_data = monthly_agg.select([
+        temperature_lf = monthly_agg.select([
             pl.col("Date"),
             pl.col("Temperature_C").alias("Temperature_Celsius"),
             pl.col("County").alias("Location"),
             pl.col("Monthly_Heat_Stress_Days").alias("Heat_Stress_Days"),
             pl.col("Monthly_Evapotranspiration_mm").alias("Evapotranspiration_mm")
-        ]).collect()
-        
-        # Save Temperature dataset
-        temperature_data.write_csv("data/weather_data/temperature_data.csv")
-        logger.info(f"✅ Temperature Dataset: {len(temperature_data)} monthly records")
-        logger.info(f"   Columns: Date, Temperature_Celsius, Location, Heat_Stress_Days, Evapotranspiration_mm")
+        ])
         
         # 4. CONSOLIDATED MONTHLY DATASET (for integration)
         logger.info("🔄 Creating Consolidated Monthly Dataset...")
-        consolidated_data = monthly_agg.select([
+        consolidated_lf = monthly_agg.select([
             pl.col("Date"),
             pl.col("County"),
             pl.col("Year"),
@@ -444,11 +661,32 @@ def create_water_scarcity_dashboard_data(weather_df: pl.DataFrame) -> None:
             pl.col("Monthly_Rainfall_mm"),
             pl.col("Monthly_Evapotranspiration_mm"),
             pl.col("Water_Stress_Index"),
-            pl.col("Irrigation_Needed"),
+            irrigation_needed_label(),
             pl.col("Irrigation_Volume_Liters_Ha"),
             pl.col("Crop_Yield_Impact_Percent"),
             pl.col("Monthly_Heat_Stress_Days")
-        ]).collect()
+        ])
+        
+        # Execute all four plans together so the shared monthly aggregation runs once
+        water_stress_data, irrigation_data, temperature_data, consolidated_data = pl.collect_all(
+            [water_stress_lf, irrigation_lf, temperature_lf, consolidated_lf],
+            engine="streaming"
+        )
+        
+        # Save Water Stress Index dataset
+        water_stress_data.write_csv("data/weather_data/water_stress_index_data.csv")
+        logger.info(f"✅ Water Stress Index Dataset: {len(water_stress_data)} monthly records")
+        logger.info(f"   Columns: Date, Water_Stress_Index, Region, Water_Availability_m3_person, Crop_Loss_Risk_Percent")
+        
+        # Save Irrigation Need dataset
+        irrigation_data.write_csv("data/weather_data/irrigation_need_data.csv")
+        logger.info(f"✅ Irrigation Need Dataset: {len(irrigation_data)} monthly records")
+        logger.info(f"   Columns: Rainfall_mm, Water_Stress_Index, Irrigation_Needed, Irrigation_Volume_Liters_Ha, Crop_Yield_Impact_Percent")
+        
+        # Save Temperature dataset
+        temperature_data.write_csv("data/weather_data/temperature_data.csv")
+        logger.info(f"✅ Temperature Dataset: {len(temperature_data)} monthly records")
+        logger.info(f"   Columns: Date, Temperature_Celsius, Location, Heat_Stress_Days, Evapotranspiration_mm")
         
         # Save consolidated dataset
         consolidated_data.write_csv("data/weather_data/consolidated_monthly_weather_data.csv")
@@ -468,32 +706,34 @@ def create_water_scarcity_dashboard_data(weather_df: pl.DataFrame) -> None:
         logger.error(f"❌ Error creating dashboard datasets: {e}")
         logger.error(f"Error details: {str(e)}")
 
-def analyze_data_coverage(weather_df: pl.DataFrame) -> None:
+def analyze_data_coverage(weather_lf: pl.LazyFrame) -> None:
     """
     Analyze the coverage and quality of collected weather data
     """
-    if weather_df is None:
+    if weather_lf is None:
         logger.error("❌ Cannot analyze coverage - no weather data")
         return
     
+    # All coverage and null statistics in a single pass over the data
+    (total_records, total_counties, total_years,
+     missing_temp, missing_humidity, missing_evap, missing_stress) = weather_lf.select([
+        pl.len(),
+        pl.col('County').n_unique(),
+        pl.col('Year').n_unique(),
+        pl.col('Temperature_C').null_count(),
+        pl.col('Humidity_Percent').null_count(),
+        pl.col('Evapotranspiration_mm').null_count(),
+        pl.col('Water_Stress_Index').null_count()
+    ]).collect(engine="streaming").row(0)
+    
     logger.info("\n📊 Multi-Omics Weather Data Coverage Analysis")
     logger.info("=" * 60)
     
     # Overall statistics
-    total_records = len(weather_df)
-    total_counties = weather_df['County'].n_unique()
-    total_years = weather_df['Year'].n_unique()
-    
     logger.info(f"📊 Total Records: {total_records:,}")
     logger.info(f"🏘️ Counties Covered: {total_counties}/20")
     logger.info(f"📅 Years Covered: {total_years}")
     
-    # Multi-omics data quality assessment (only check columns that exist)
-    missing_temp = len(weather_df.filter(pl.col('Temperature_C').is_null()))
-    missing_humidity = len(weather_df.filter(pl.col('Humidity_Percent').is_null()))
-    missing_evap = len(weather_df.filter(pl.col('Evapotranspiration_mm').is_null()))
-    missing_stress = len(weather_df.filter(pl.col('Water_Stress_Index').is_null()))
-    
     logger.info(f"\n🔬 Multi-Omics Data Quality Assessment:")
     logger.info(f"  • Climate-Omics (Temperature): {missing_temp:,} missing ({missing_temp/total_records*100:.1f}%)")
     logger.info(f"  • Climate-Omics (Humidity): {missing_humidity:,} missing ({missing_humidity/total_records*100:.1f}%)")
@@ -533,22 +773,28 @@ def main():
     
     # Collect weather data
     start_time = time.time()
-    weather_df = collect_all_counties_weather_data()
+    weather_lf = collect_all_counties_weather_data()
     collection_time = time.time() - start_time
     
-    if weather_df is not None:
+    if weather_lf is not None:
         # Analyze coverage
-        analyze_data_coverage(weather_df)
+        analyze_data_coverage(weather_lf)
+        
+        # Create Water Scarcity Dashboard datasets from the stored monthly aggregates
+        create_water_scarcity_dashboard_data(aggregate_monthly_weather(weather_lf))
         
-        # Create Water Scarcity Dashboard datasets
-        create_water_scarcity_dashboard_data(weather_df)
+        total_records, total_counties, total_years = weather_lf.select(
+            pl.len(),
+            pl.col("County").n_unique(),
+            pl.col("Year").n_unique()
+        ).collect().row(0)
         
         # Summary
         logger.info(f"\n🎯 Collection Summary:")
         logger.info(f"  • Total time: {collection_time:.1f} seconds")
-        logger.info(f"  • Records collected: {len(weather_df):,}")
-        logger.info(f"  • Counties covered: {weather_df['County'].n_unique()}/20")
-        logger.info(f"  • Years covered: {weather_df['Year'].n_unique()}")
+        logger.info(f"  • Records collected: {total_records:,}")
+        logger.info(f"  • Counties covered: {total_counties}/20")
+        logger.info(f"  • Years covered: {total_years}")
         logger.info(f"  • Output file: data/weather_data/kenya_counties_weather_2019-2023.csv")
         
         logger.info(f"\n✅ Multi-omics weather data collection completed successfully!")
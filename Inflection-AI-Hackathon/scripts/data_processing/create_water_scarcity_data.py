@@ -30,121 +30,193 @@ EXPECTED_COLUMNS = [
     'Crop_Yield_Impact_Percent', 'Heat_Stress_Days'
 ]
 
-def load_and_validate_weather_data(data_dir: Path) -> pl.DataFrame:
-    """Load and validate all weather data files."""
-    logger.info("📁 Loading weather data files...")
+# Hourly records expected per county for full coverage (5 years * 365 days * 24 hours)
+EXPECTED_RECORDS_PER_COUNTY = 43_824
+
+# Explicit dtypes for the weather columns so every file (including header-only ones) scans
+# with the same schema instead of relying on per-file inference; County is Categorical so the
+# County/Year/Month group_by hashes a small integer code instead of the string bytes.
+# Measurements are Float32 (ample precision for monthly means/sums, half the bandwidth)
+# and the integer-valued indicators use the narrowest type that holds their range.
+WEATHER_SCHEMA_OVERRIDES = {
+    'County': pl.Categorical,
+    'Year': pl.Int16, 'Month': pl.UInt8, 'Day': pl.UInt8, 'Hour': pl.UInt8,
+    'Latitude': pl.Float32, 'Longitude': pl.Float32,
+    'Temperature_C': pl.Float32, 'Humidity_Percent': pl.Float32, 'Pressure_hPa': pl.Float32,
+    'Evapotranspiration_mm': pl.Float32, 'Precipitation_mm': pl.Float32,
+    'Water_Stress_Index': pl.Float32, 'Irrigation_Volume_Liters_Ha': pl.Int16,
+    'Crop_Yield_Impact_Percent': pl.Int8, 'Heat_Stress_Days': pl.Int8
+}
+
+# Hourly columns consumed by the monthly dashboard aggregation
+MONTHLY_INPUT_COLUMNS = [
+    'County', 'Year', 'Month', 'Temperature_C', 'Humidity_Percent',
+    'Evapotranspiration_mm', 'Precipitation_mm', 'Water_Stress_Index', 'Irrigation_Needed',
+    'Irrigation_Volume_Liters_Ha', 'Crop_Yield_Impact_Percent', 'Heat_Stress_Days'
+]
+
+# Output columns (in order) of each dashboard dataset
+WATER_STRESS_COLUMNS = [
+    'County', 'Year', 'Month', 'Month_Name', 'Month_Start_Date',
+    'Water_Stress_Index', 'Water_Availability_m3_Person', 'Crop_Loss_Risk_Percent',
+    'Monthly_Rainfall_mm', 'Monthly_Evapotranspiration_mm', 'Monthly_Humidity_Percent'
+]
+
+IRRIGATION_NEED_COLUMNS = [
+    'County', 'Year', 'Month', 'Month_Name', 'Month_Start_Date',
+    'Monthly_Rainfall_mm', 'Monthly_Water_Stress_Index', 'Monthly_Irrigation_Needed',
+    'Monthly_Irrigation_Volume_Liters_Ha', 'Monthly_Crop_Yield_Impact_Percent',
+    'Irrigation_Efficiency_Score', 'Water_Savings_Potential_Liters_Ha', 'Monthly_Temperature_C'
+]
+
+TEMPERATURE_COLUMNS = [
+    'County', 'Year', 'Month', 'Month_Name', 'Month_Start_Date',
+    'Monthly_Temperature_C', 'Monthly_Max_Temperature_C', 'Monthly_Min_Temperature_C',
+    'Monthly_Heat_Stress_Days', 'Heat_Stress_Severity_Score', 'Temperature_Variability_C',
+    'Climate_Zone', 'Monthly_Evapotranspiration_mm', 'Monthly_Humidity_Percent'
+]
+
+DASHBOARD_COLUMNS = {
+    "water_stress_index_data": WATER_STRESS_COLUMNS,
+    "irrigation_need_data": IRRIGATION_NEED_COLUMNS,
+    "temperature_data": TEMPERATURE_COLUMNS
+}
+
+# zstd level for the Parquet copies of the dashboard datasets
+PARQUET_COMPRESSION_LEVEL = 3
+
+# Month number -> name lookup shared by all dashboard datasets
+MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+_MONTH_LUT = dict(enumerate(MONTH_NAMES, start=1))
+
+def month_name_expr() -> pl.Expr:
+    """Vectorized Month -> Month_Name lookup (falls back to the month number as text)."""
+    return (pl.col('Month')
+        .replace_strict(_MONTH_LUT, default=pl.col('Month').cast(pl.Utf8), return_dtype=pl.Utf8)
+        .alias('Month_Name'))
+
+def climate_zone_expr(temp: pl.Expr) -> pl.Expr:
+    """Vectorized climate zone classification from mean monthly temperature."""
+    return (pl.when(temp > 30).then(pl.lit('Hot'))
+        .when(temp > 25).then(pl.lit('Warm'))
+        .when(temp > 20).then(pl.lit('Moderate'))
+        .when(temp > 15).then(pl.lit('Cool'))
+        .when(temp.is_not_null()).then(pl.lit('Cold'))
+        .otherwise(pl.lit(None, dtype=pl.Utf8))
+        .alias('Climate_Zone'))
+
+def load_and_validate_weather_data(data_dir: Path) -> pl.LazyFrame:
+    """Lazily scan and validate all weather data files."""
+    logger.info("📁 Scanning weather data files...")
     
     weather_files = list(data_dir.glob("weather_data_*.csv"))
     if not weather_files:
         raise FileNotFoundError(f"No weather data files found in {data_dir}")
     
-    # Load all files and combine
-    all_data = []
-    county_stats = {}
+    # One lazy scan over every county file; nothing is materialized until the dashboards collect
+    scan_lf = pl.scan_csv(str(data_dir / "weather_data_*.csv"),
+                          schema_overrides=WEATHER_SCHEMA_OVERRIDES,
+                          include_file_paths='source_file')
     
-    for file_path in weather_files:
-        try:
-            df = pl.read_csv(file_path)
-            if len(df) > 0:  # Skip empty files
-                all_data.append(df)
-                county_name = file_path.stem.replace('weather_data_', '').replace('_', ' ').title()
-                county_stats[county_name] = len(df)
-                logger.info(f"  ✅ Loaded {file_path.name}: {len(df):,} records")
-            else:
-                logger.warning(f"  ⚠️ Skipped {file_path.name}: Empty file")
-        except Exception as e:
-            logger.error(f"  ❌ Error loading {file_path.name}: {e}")
+    # Validate structure from the schema alone
+    missing_cols = set(EXPECTED_COLUMNS) - set(scan_lf.collect_schema().names())
+    if missing_cols:
+        raise ValueError(f"Missing columns: {missing_cols}")
     
-    if not all_data:
+    # Per-file record counts and coverage computed in Polars from a single pass over the scan;
+    # files that parse to zero rows are absent from the group_by and come back as 0 records
+    file_stats = (pl.LazyFrame({'source_file': sorted(str(f) for f in weather_files)})
+        .join(scan_lf.group_by('source_file').agg(pl.len().alias('records')),
+              on='source_file', how='left')
+        .with_columns(
+            pl.col('records').fill_null(0),
+            pl.col('source_file').str.extract(r'weather_data_([^/\\]+)\.csv$')
+                .str.replace_all('_', ' ').str.to_titlecase().alias('County')
+        )
+        .with_columns((pl.col('records') / EXPECTED_RECORDS_PER_COUNTY * 100).alias('Coverage_Percent'))
+        .collect()
+    )
+    loaded = file_stats.filter(pl.col('records') > 0)
+    if loaded.is_empty():
         raise ValueError("No valid weather data files found")
     
-    # Combine all data
-    combined_df = pl.concat(all_data)
-    logger.info(f"📊 Combined dataset: {len(combined_df):,} total records")
+    for source_file, record_count in file_stats.select('source_file', 'records').iter_rows():
+        if record_count > 0:
+            logger.info(f"  ✅ Loaded {Path(source_file).name}: {record_count:,} records")
+        else:
+            logger.warning(f"  ⚠️ Skipped {Path(source_file).name}: Empty file")
+    
+    logger.info(f"📊 Combined dataset: {loaded['records'].sum():,} total records")
     
     # Check data quality per county
     logger.info("\n📊 Data Quality Check by County:")
-    for county, record_count in county_stats.items():
-        expected_records = 43_824  # 5 years * 365 days * 24 hours
-        coverage_percent = (record_count / expected_records) * 100
+    expected_records = EXPECTED_RECORDS_PER_COUNTY
+    for county, record_count, coverage_percent in loaded.select('County', 'records', 'Coverage_Percent').iter_rows():
         if coverage_percent < 80:
             logger.warning(f"  ⚠️ {county}: {coverage_percent:.1f}% coverage ({record_count:,}/{expected_records:,} records)")
         else:
             logger.info(f"  ✅ {county}: {coverage_percent:.1f}% coverage ({record_count:,}/{expected_records:,} records)")
     
-    # Validate structure
-    if len(combined_df.columns) != len(EXPECTED_COLUMNS):
-        missing_cols = set(EXPECTED_COLUMNS) - set(combined_df.columns)
-        raise ValueError(f"Missing columns: {missing_cols}")
-    
-    return combined_df
+    return scan_lf.drop('source_file')
 
-def create_water_stress_index_data(df: pl.DataFrame) -> pl.DataFrame:
-    """Create Water Stress Index Data with monthly aggregation."""
-    logger.info("🌊 Creating Water Stress Index Data...")
-    
-    # Aggregate to monthly data
-    monthly_data = (df
-        .lazy()
+def aggregate_monthly_weather(weather_lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Build the lazy County/Year/Month aggregation shared by all dashboard datasets."""
+    logger.info("📅 Planning monthly aggregation of hourly weather data...")
+    
+    # Every aggregate used by the three dashboard datasets, computed once over only the
+    # hourly columns they consume (Time/Day/Hour/Lat/Lon/Pressure never reach the group_by)
+    monthly_data = (weather_lf
+        .select(MONTHLY_INPUT_COLUMNS)
         .group_by(['County', 'Year', 'Month'])
         .agg([
-            pl.col('Water_Stress_Index').mean().alias('Water_Stress_Index'),
+            pl.col('Water_Stress_Index').mean().alias('Monthly_Water_Stress_Index'),
             pl.col('Precipitation_mm').sum().alias('Monthly_Rainfall_mm'),
             pl.col('Evapotranspiration_mm').mean().alias('Monthly_Evapotranspiration_mm'),
             pl.col('Humidity_Percent').mean().alias('Monthly_Humidity_Percent'),
-            pl.col('Date').first().alias('Month_Start_Date')
+            pl.col('Temperature_C').mean().alias('Monthly_Temperature_C'),
+            pl.col('Temperature_C').max().alias('Monthly_Max_Temperature_C'),
+            pl.col('Temperature_C').min().alias('Monthly_Min_Temperature_C'),
+            pl.col('Heat_Stress_Days').sum().alias('Monthly_Heat_Stress_Days'),
+            pl.col('Irrigation_Needed').first().alias('Monthly_Irrigation_Needed'),
+            pl.col('Irrigation_Volume_Liters_Ha').mean().alias('Monthly_Irrigation_Volume_Liters_Ha'),
+            pl.col('Crop_Yield_Impact_Percent').mean().alias('Monthly_Crop_Yield_Impact_Percent')
         ])
-        .collect()
+        # First day of the group's month, derived from the keys instead of carried through the hash build
+        .with_columns(pl.date(pl.col('Year'), pl.col('Month'), 1).alias('Month_Start_Date'))
     )
     
+    return monthly_data
+
+def create_water_stress_index_data(monthly_data: pl.LazyFrame) -> pl.LazyFrame:
+    """Create Water Stress Index Data from the monthly aggregates."""
+    logger.info("🌊 Creating Water Stress Index Data...")
+    
     # Calculate derived metrics
     water_stress_data = monthly_data.with_columns([
+            pl.col('Monthly_Water_Stress_Index').alias('Water_Stress_Index'),
+            
             # Water availability (m³/person) - simplified calculation
-            (1000 - (pl.col('Water_Stress_Index') * 1000)).alias('Water_Availability_m3_Person'),
+            (1000 - (pl.col('Monthly_Water_Stress_Index') * 1000)).alias('Water_Availability_m3_Person'),
             
             # Crop loss risk (%) - based on water stress
-            (pl.col('Water_Stress_Index') * 50).alias('Crop_Loss_Risk_Percent'),
+            (pl.col('Monthly_Water_Stress_Index') * 50).alias('Crop_Loss_Risk_Percent'),
             
             # Format month name
-            pl.col('Month').map_elements(lambda x: {
-                1: 'January', 2: 'February', 3: 'March', 4: 'April',
-                5: 'May', 6: 'June', 7: 'July', 8: 'August',
-                9: 'September', 10: 'October', 11: 'November', 12: 'December'
-            }.get(x, str(x)), return_dtype=pl.Utf8).alias('Month_Name')
+            month_name_expr()
         ])
     
     # Select and reorder columns for dashboard
-    final_columns = [
-        'County', 'Year', 'Month', 'Month_Name', 'Month_Start_Date',
-        'Water_Stress_Index', 'Water_Availability_m3_Person', 'Crop_Loss_Risk_Percent',
-        'Monthly_Rainfall_mm', 'Monthly_Evapotranspiration_mm', 'Monthly_Humidity_Percent'
-    ]
+    water_stress_data = water_stress_data.select(WATER_STRESS_COLUMNS)
     
-    water_stress_data = water_stress_data.select(final_columns)
-    
-    logger.info(f"  ✅ Created Water Stress Index Data: {len(water_stress_data):,} monthly records")
     return water_stress_data
 
-def create_irrigation_need_data(df: pl.DataFrame) -> pl.DataFrame:
-    """Create Irrigation Need Data with monthly aggregation."""
+def create_irrigation_need_data(monthly_data: pl.LazyFrame) -> pl.LazyFrame:
+    """Create Irrigation Need Data from the monthly aggregates."""
     logger.info("💧 Creating Irrigation Need Data...")
     
-    # Aggregate to monthly data
-    monthly_data = (df
-        .lazy()
-        .group_by(['County', 'Year', 'Month'])
-        .agg([
-            pl.col('Precipitation_mm').sum().alias('Monthly_Rainfall_mm'),
-            pl.col('Water_Stress_Index').mean().alias('Monthly_Water_Stress_Index'),
-            pl.col('Temperature_C').mean().alias('Monthly_Temperature_C'),
-            pl.col('Irrigation_Needed').first().alias('Monthly_Irrigation_Needed'),
-            pl.col('Irrigation_Volume_Liters_Ha').mean().alias('Monthly_Irrigation_Volume_Liters_Ha'),
-            pl.col('Crop_Yield_Impact_Percent').mean().alias('Monthly_Crop_Yield_Impact_Percent'),
-            pl.col('Date').first().alias('Month_Start_Date')
-        ])
-        .collect()
-    )
-    
     # Calculate derived metrics
     irrigation_data = monthly_data.with_columns([
         # Irrigation efficiency score (0-100)
@@ -154,46 +226,18 @@ def create_irrigation_need_data(df: pl.DataFrame) -> pl.DataFrame:
         (pl.col('Monthly_Irrigation_Volume_Liters_Ha') * 0.2).alias('Water_Savings_Potential_Liters_Ha'),
         
         # Format month name
-        pl.col('Month').map_elements(lambda x: {
-            1: 'January', 2: 'February', 3: 'March', 4: 'April',
-            5: 'May', 6: 'June', 7: 'July', 8: 'August',
-            9: 'September', 10: 'October', 11: 'November', 12: 'December'
-        }.get(x, str(x)), return_dtype=pl.Utf8).alias('Month_Name')
+        month_name_expr()
     ])
     
     # Select and reorder columns for dashboard
-    final_columns = [
-        'County', 'Year', 'Month', 'Month_Name', 'Month_Start_Date',
-        'Monthly_Rainfall_mm', 'Monthly_Water_Stress_Index', 'Monthly_Irrigation_Needed',
-        'Monthly_Irrigation_Volume_Liters_Ha', 'Monthly_Crop_Yield_Impact_Percent',
-        'Irrigation_Efficiency_Score', 'Water_Savings_Potential_Liters_Ha', 'Monthly_Temperature_C'
-    ]
+    irrigation_data = irrigation_data.select(IRRIGATION_NEED_COLUMNS)
     
-    irrigation_data = irrigation_data.select(final_columns)
-    
-    logger.info(f"  ✅ Created Irrigation Need Data: {len(irrigation_data):,} monthly records")
     return irrigation_data
 
-def create_temperature_data(df: pl.DataFrame) -> pl.DataFrame:
-    """Create Temperature Data with monthly aggregation."""
+def create_temperature_data(monthly_data: pl.LazyFrame) -> pl.LazyFrame:
+    """Create Temperature Data from the monthly aggregates."""
     logger.info("🌡️ Creating Temperature Data...")
     
-    # Aggregate to monthly data
-    monthly_data = (df
-        .lazy()
-        .group_by(['County', 'Year', 'Month'])
-        .agg([
-            pl.col('Temperature_C').mean().alias('Monthly_Temperature_C'),
-            pl.col('Temperature_C').max().alias('Monthly_Max_Temperature_C'),
-            pl.col('Temperature_C').min().alias('Monthly_Min_Temperature_C'),
-            pl.col('Heat_Stress_Days').sum().alias('Monthly_Heat_Stress_Days'),
-            pl.col('Evapotranspiration_mm').mean().alias('Monthly_Evapotranspiration_mm'),
-            pl.col('Humidity_Percent').mean().alias('Monthly_Humidity_Percent'),
-            pl.col('Date').first().alias('Month_Start_Date')
-        ])
-        .collect()
-    )
-    
     # Calculate derived metrics
     temperature_data = monthly_data.with_columns([
         # Heat stress severity (0-100 scale)
@@ -203,80 +247,62 @@ def create_temperature_data(df: pl.DataFrame) -> pl.DataFrame:
         (pl.col('Monthly_Max_Temperature_C') - pl.col('Monthly_Min_Temperature_C')).alias('Temperature_Variability_C'),
         
         # Climate zone classification
-        pl.col('Monthly_Temperature_C').map_elements(lambda x: 
-            'Hot' if x > 30 else 
-            'Warm' if x > 25 else 
-            'Moderate' if x > 20 else 
-            'Cool' if x > 15 else 'Cold', 
-            return_dtype=pl.Utf8
-        ).alias('Climate_Zone'),
+        climate_zone_expr(pl.col('Monthly_Temperature_C')),
         
         # Format month name
-        pl.col('Month').map_elements(lambda x: {
-            1: 'January', 2: 'February', 3: 'March', 4: 'April',
-            5: 'May', 6: 'June', 7: 'July', 8: 'August',
-            9: 'September', 10: 'October', 11: 'November', 12: 'December'
-        }.get(x, str(x)), return_dtype=pl.Utf8).alias('Month_Name')
+        month_name_expr()
     ])
     
     # Select and reorder columns for dashboard
-    final_columns = [
-        'County', 'Year', 'Month', 'Month_Name', 'Month_Start_Date',
-        'Monthly_Temperature_C', 'Monthly_Max_Temperature_C', 'Monthly_Min_Temperature_C',
-        'Monthly_Heat_Stress_Days', 'Heat_Stress_Severity_Score', 'Temperature_Variability_C',
-        'Climate_Zone', 'Monthly_Evapotranspiration_mm', 'Monthly_Humidity_Percent'
-    ]
-    
-    temperature_data = temperature_data.select(final_columns)
+    temperature_data = temperature_data.select(TEMPERATURE_COLUMNS)
     
-    logger.info(f"  ✅ Created Temperature Data: {len(temperature_data):,} monthly records")
     return temperature_data
 
-def save_dashboard_datasets(water_stress_data: pl.DataFrame, 
-                           irrigation_data: pl.DataFrame, 
-                           temperature_data: pl.DataFrame,
-                           output_dir: Path) -> None:
-    """Save all dashboard datasets to CSV files."""
+def _summary_lf(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """One-row lazy summary (record count, counties, years) of a dashboard dataset."""
+    return lf.select(
+        pl.len().alias('total_records'),
+        pl.col('County').unique().implode().alias('counties'),
+        pl.col('Year').unique().sort().implode().alias('years')
+    )
+
+def save_dashboard_datasets(water_stress_data: pl.LazyFrame, 
+                           irrigation_data: pl.LazyFrame, 
+                           temperature_data: pl.LazyFrame,
+                           output_dir: Path) -> Dict:
+    """Stream all dashboard datasets to CSV files and return their summary statistics."""
     logger.info("💾 Saving dashboard datasets...")
     
     # Create output directory if it doesn't exist
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Save Water Stress Index Data
-    water_stress_file = output_dir / "water_stress_index_data.csv"
-    water_stress_data.write_csv(water_stress_file)
-    logger.info(f"  💾 Water Stress Index Data: {water_stress_file}")
-    
-    # Save Irrigation Need Data
-    irrigation_file = output_dir / "irrigation_need_data.csv"
-    irrigation_data.write_csv(irrigation_file)
-    logger.info(f"  💾 Irrigation Need Data: {irrigation_file}")
+    datasets = {
+        "water_stress_index_data": water_stress_data,
+        "irrigation_need_data": irrigation_data,
+        "temperature_data": temperature_data
+    }
     
-    # Save Temperature Data
-    temperature_file = output_dir / "temperature_data.csv"
-    temperature_data.write_csv(temperature_file)
-    logger.info(f"  💾 Temperature Data: {temperature_file}")
+    # Stream all three plans straight to disk together so the shared monthly aggregation runs once;
+    # each dataset is written as CSV (existing consumers) and zstd Parquet (columnar dashboard loads).
+    # The summary queries run in the same batch, so they add no extra passes over the data.
+    sinks = []
+    for name, lf in datasets.items():
+        csv_file = output_dir / f"{name}.csv"
+        sinks.append(lf.sink_csv(csv_file, lazy=True))
+        sinks.append(lf.sink_parquet(csv_file.with_suffix('.parquet'), compression='zstd',
+                                     compression_level=PARQUET_COMPRESSION_LEVEL,
+                                     statistics=True, lazy=True))
+    summaries = pl.collect_all(
+        sinks + [_summary_lf(lf) for lf in datasets.values()], engine="streaming"
+    )[len(sinks):]
+    logger.info(f"  💾 Water Stress Index Data: {output_dir / 'water_stress_index_data.csv'} (+ .parquet)")
+    logger.info(f"  💾 Irrigation Need Data: {output_dir / 'irrigation_need_data.csv'} (+ .parquet)")
+    logger.info(f"  💾 Temperature Data: {output_dir / 'temperature_data.csv'} (+ .parquet)")
     
     # Create summary statistics
     summary_stats = {
-        "water_stress_index_data": {
-            "total_records": len(water_stress_data),
-            "counties": water_stress_data.select('County').unique().to_series().to_list(),
-            "years": sorted(water_stress_data.select('Year').unique().to_series().to_list()),
-            "columns": water_stress_data.columns
-        },
-        "irrigation_need_data": {
-            "total_records": len(irrigation_data),
-            "counties": irrigation_data.select('County').unique().to_series().to_list(),
-            "years": sorted(irrigation_data.select('Year').unique().to_series().to_list()),
-            "columns": irrigation_data.columns
-        },
-        "temperature_data": {
-            "total_records": len(temperature_data),
-            "counties": temperature_data.select('County').unique().to_series().to_list(),
-            "years": sorted(temperature_data.select('Year').unique().to_series().to_list()),
-            "columns": temperature_data.columns
-        }
+        name: {**summary.row(0, named=True), "columns": DASHBOARD_COLUMNS[name]}
+        for name, summary in zip(datasets, summaries)
     }
     
     # Save summary to JSON
@@ -285,6 +311,7 @@ def save_dashboard_datasets(water_stress_data: pl.DataFrame,
         json.dump(summary_stats, f, indent=2)
     
     logger.info(f"  💾 Summary Statistics: {summary_file}")
+    return summary_stats
 
 def main():
     """Main function to generate Water Scarcity Dashboard datasets."""
@@ -298,30 +325,31 @@ def main():
     try:
         # Step 1: Load and validate weather data
         logger.info("\n📊 Step 1: Loading weather data...")
-        weather_df = load_and_validate_weather_data(data_dir)
+        weather_lf = load_and_validate_weather_data(data_dir)
+        monthly_df = aggregate_monthly_weather(weather_lf)
         
         # Step 2: Generate Water Stress Index Data
         logger.info("\n🌊 Step 2: Generating Water Stress Index Data...")
-        water_stress_data = create_water_stress_index_data(weather_df)
+        water_stress_data = create_water_stress_index_data(monthly_df)
         
         # Step 3: Generate Irrigation Need Data
         logger.info("\n💧 Step 3: Generating Irrigation Need Data...")
-        irrigation_data = create_irrigation_need_data(weather_df)
+        irrigation_data = create_irrigation_need_data(monthly_df)
         
         # Step 4: Generate Temperature Data
         logger.info("\n🌡️ Step 4: Generating Temperature Data...")
-        temperature_data = create_temperature_data(weather_df)
+        temperature_data = create_temperature_data(monthly_df)
         
         # Step 5: Save all datasets
         logger.info("\n💾 Step 5: Saving dashboard datasets...")
-        save_dashboard_datasets(water_stress_data, irrigation_data, temperature_data, output_dir)
+        summary_stats = save_dashboard_datasets(water_stress_data, irrigation_data, temperature_data, output_dir)
         
         # Summary
         logger.info("\n🎉 Water Scarcity Data Generation Complete!")
         logger.info("=" * 45)
-        logger.info(f"📊 Water Stress Index Data: {len(water_stress_data):,} monthly records")
-        logger.info(f"💧 Irrigation Need Data: {len(irrigation_data):,} monthly records")
-        logger.info(f"🌡️ Temperature Data: {len(temperature_data):,} monthly records")
+        logger.info(f"📊 Water Stress Index Data: {summary_stats['water_stress_index_data']['total_records']:,} monthly records")
+        logger.info(f"💧 Irrigation Need Data: {summary_stats['irrigation_need_data']['total_records']:,} monthly records")
+        logger.info(f"🌡️ Temperature Data: {summary_stats['temperature_data']['total_records']:,} monthly records")
         logger.info(f"📁 Output directory: {output_dir}")
         logger.info("\n🚀 Ready for Water Scarcity Dashboard deployment!")
         
@@ -10,16 +10,20 @@ rainfall estimates combining satellite IR data with ground station measurements.
 CHIRPS Data Source: https://data.chc.ucsb.edu/products/CHIRPS-2.0/
 API Endpoint: https://data.chc.ucsb.edu/products/CHIRPS-2.0/global_monthly/tifs/
 
-Output: Monthly GeoTIFF files in data/chirps_data/
+Output: Monthly GeoTIFF files (cropped to Kenya) in data/chirps_data/
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+import rasterio
+from rasterio.windows import from_bounds
 import os
+import json
+import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
-import time
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 # Set up logging
 logging.basicConfig(
@@ -32,6 +36,12 @@ logger = logging.getLogger(__name__)
 CHIRPS_BASE_URL = "https://data.chc.ucsb.edu/products/CHIRPS-2.0/global_monthly/tifs"
 CHIRPS_VERSION = "v3.0"
 
+# Parallel downloads share one keep-alive connection pool to the CHIRPS host
+MAX_DOWNLOAD_WORKERS = 8
+
+# Copy buffer size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 # Kenya bounding box (approximate)
 KENYA_BOUNDS = {
     'min_lat': -4.5,
@@ -40,23 +50,131 @@ KENYA_BOUNDS = {
     'max_lon': 42.0
 }
 
+# GDAL settings so /vsicurl/ fetches only the byte ranges covering the requested window
+VSICURL_OPTIONS = {
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'EMPTY_DIR',
+    'CPL_VSIL_CURL_ALLOWED_EXTENSIONS': '.tif'
+}
+
 def get_monthly_dates(start_year: int = 2019, end_year: int = 2023) -> List[Tuple[int, int]]:
     """Generate list of year-month tuples for the specified period."""
-    dates = []
-    current_date = datetime(start_year, 1, 1)
-    end_date = datetime(end_year, 12, 31)
+    return [(year, month) for year in range(start_year, end_year + 1) for month in range(1, 13)]
+
+def create_session(pool_size: int = MAX_DOWNLOAD_WORKERS) -> requests.Session:
+    """Create a requests session whose connection pool matches the download worker count."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def download_kenya_window(url: str, output_path: Path) -> None:
+    """
+    Read only the Kenya window of a remote CHIRPS GeoTIFF and save it as a local GeoTIFF.
+    
+    The remote file is opened through GDAL's /vsicurl/ handler, which issues HTTP range
+    requests for just the tiles/strips intersecting KENYA_BOUNDS instead of the global raster.
+    """
+    with rasterio.Env(**VSICURL_OPTIONS), rasterio.open(f"/vsicurl/{url}") as src:
+        window = from_bounds(
+            KENYA_BOUNDS['min_lon'], KENYA_BOUNDS['min_lat'],
+            KENYA_BOUNDS['max_lon'], KENYA_BOUNDS['max_lat'],
+            transform=src.transform
+        ).round_offsets().round_lengths()
+        data = src.read(1, window=window)
+        profile = {
+            'driver': 'GTiff',
+            'dtype': data.dtype,
+            'count': 1,
+            'height': data.shape[0],
+            'width': data.shape[1],
+            'crs': src.crs,
+            'transform': src.window_transform(window),
+            'nodata': src.nodata,
+            'compress': 'deflate'
+        }
+    
+    with rasterio.open(output_path, 'w', **profile) as dst:
+        dst.write(data, 1)
+
+def get_remote_validators(headers) -> Dict[str, str]:
+    """Extract the HTTP cache validators (ETag / Last-Modified) from response headers."""
+    return {key: headers[key] for key in ('ETag', 'Last-Modified') if headers.get(key)}
+
+def load_download_meta(meta_path: Path) -> Dict[str, str]:
+    """Load the validators recorded for a previous download, if any."""
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_download_meta(meta_path: Path, validators: Dict[str, str]) -> None:
+    """Record the remote validators of a completed download for future conditional checks."""
+    if validators:
+        with open(meta_path, 'w') as f:
+            json.dump(validators, f)
+
+def download_full_file(session: requests.Session, url: str, output_path: Path) -> Dict[str, str]:
+    """
+    Stream the complete remote file to output_path, resuming a previous partial download.
+    
+    The body is written to a ``.part`` file whose validators are kept in a sidecar; if one
+    exists, only the missing tail is requested with Range + If-Range, so a remote file that
+    changed in the meantime is fetched whole instead of being appended to a stale prefix.
     
-    while current_date <= end_date:
-        dates.append((current_date.year, current_date.month))
-        current_date = (current_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+    Returns:
+        dict: Validators of the downloaded remote file
+    """
+    part_path = output_path.with_name(output_path.name + ".part")
+    part_meta_path = output_path.with_name(output_path.name + ".part.meta.json")
+    part_validators = load_download_meta(part_meta_path)
+    headers = {}
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if offset and part_validators:
+        headers['Range'] = f"bytes={offset}-"
+        headers['If-Range'] = part_validators.get('ETag') or part_validators['Last-Modified']
+    
+    # Stream the body straight to disk in a C-level copy loop (no per-chunk Python work)
+    with session.get(url, stream=True, timeout=30, headers=headers) as response:
+        if response.status_code == 416:
+            # Nothing past the offset: the .part is finished if it matches the remote size
+            # ("Content-Range: bytes */<size>"), otherwise discard it and fetch the file whole
+            remote_size = response.headers.get('Content-Range', '').rpartition('/')[2]
+            if remote_size != str(offset):
+                part_path.unlink()
+                if part_meta_path.exists():
+                    part_meta_path.unlink()
+                return download_full_file(session, url, output_path)
+            logger.info(f"    ↪️ {output_path.name} was already fully downloaded")
+            part_path.replace(output_path)
+            part_meta_path.unlink()
+            return part_validators
+        response.raise_for_status()
+        resumed = response.status_code == 206
+        if resumed:
+            logger.info(f"    ↪️ Resuming {output_path.name} from {offset / (1024 * 1024):.1f} MB")
+        else:
+            part_validators = get_remote_validators(response.headers)
+            save_download_meta(part_meta_path, part_validators)
+        response.raw.decode_content = True
+        with open(part_path, 'ab' if resumed else 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
     
-    return dates
+    part_path.replace(output_path)
+    if part_meta_path.exists():
+        part_meta_path.unlink()
+    return part_validators
 
-def download_chirps_file(year: int, month: int, output_dir: Path) -> bool:
+def download_chirps_file(session: requests.Session, year: int, month: int, output_dir: Path) -> bool:
     """
     Download a single CHIRPS monthly rainfall file.
     
+    Existing files are re-used unless the remote ETag/Last-Modified recorded in the
+    ``.meta.json`` sidecar has changed.
+    
     Args:
+        session: Shared HTTP session (connection pooling / keep-alive)
         year: Year (e.g., 2019)
         month: Month (1-12)
         output_dir: Directory to save the file
@@ -69,37 +187,40 @@ def download_chirps_file(year: int, month: int, output_dir: Path) -> bool:
     url = f"{CHIRPS_BASE_URL}/{filename}"
     
     output_path = output_dir / filename
-    
-    # Skip if file already exists
-    if output_path.exists():
-        logger.info(f"  ✅ {filename} already exists, skipping...")
-        return True
+    meta_path = output_dir / f"{filename}.meta.json"
+    window_path = output_dir / f"{filename}.window.tmp"
     
     try:
-        logger.info(f"  📥 Downloading {filename}...")
+        # Cheap HEAD to learn the remote validators (used for skip checks and resume guards)
+        try:
+            head = session.head(url, timeout=10, allow_redirects=True)
+            remote_validators = get_remote_validators(head.headers) if head.ok else {}
+        except requests.exceptions.RequestException:
+            remote_validators = {}
         
-        # Download with progress tracking
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
+        # Skip if file already exists and the remote copy has not changed
+        if output_path.exists():
+            cached_validators = load_download_meta(meta_path)
+            if not remote_validators or not cached_validators or cached_validators == remote_validators:
+                logger.info(f"  ✅ {filename} already exists, skipping...")
+                return True
+            logger.info(f"  🔄 {filename} changed on the server, re-downloading...")
         
-        # Get file size for progress tracking
-        total_size = int(response.headers.get('content-length', 0))
+        logger.info(f"  📥 Downloading {filename}...")
         
-        # Download and save file
-        with open(output_path, 'wb') as f:
-            downloaded = 0
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    
-                    # Show progress
-                    if total_size > 0:
-                        progress = (downloaded / total_size) * 100
-                        logger.info(f"    Progress: {progress:.1f}%")
+        try:
+            # Fetch only the Kenya subset of the global raster via HTTP range requests
+            download_kenya_window(url, window_path)
+            window_path.replace(output_path)
+        except rasterio.errors.RasterioIOError as e:
+            logger.warning(f"    ⚠️ Windowed read failed for {filename} ({e}), downloading full file...")
+            if window_path.exists():
+                window_path.unlink()
+            remote_validators = download_full_file(session, url, output_path)
         
         # Verify file size
         if output_path.exists() and output_path.stat().st_size > 0:
+            save_download_meta(meta_path, remote_validators)
             file_size_mb = output_path.stat().st_size / (1024 * 1024)
             logger.info(f"    ✅ Downloaded {filename} ({file_size_mb:.1f} MB)")
             return True
@@ -110,14 +231,14 @@ def download_chirps_file(year: int, month: int, output_dir: Path) -> bool:
             return False
             
     except requests.exceptions.RequestException as e:
+        # Any .part file is kept so the next run can resume it
         logger.error(f"    ❌ Download failed for {filename}: {e}")
-        if output_path.exists():
-            output_path.unlink()  # Remove failed download
         return False
     except Exception as e:
         logger.error(f"    ❌ Unexpected error downloading {filename}: {e}")
-        if output_path.exists():
-            output_path.unlink()  # Remove failed download
+        for path in (output_path, window_path):
+            if path.exists():
+                path.unlink()  # Remove failed download
         return False
 
 def download_chirps_data(start_year: int = 2019, end_year: int = 2023) -> bool:
@@ -134,7 +255,7 @@ def download_chirps_data(start_year: int = 2019, end_year: int = 2023) -> bool:
     logger.info("🌧️ Starting CHIRPS Rainfall Data Download")
     logger.info("=" * 50)
     logger.info(f"📅 Period: {start_year}-{end_year}")
-    logger.info(f"🌍 Region: Kenya (Global coverage)")
+    logger.info(f"🌍 Region: Kenya (windowed from global coverage)")
     logger.info(f"📊 Resolution: 0.05° (~5.5km)")
     logger.info(f"💾 Format: GeoTIFF (.tif)")
     
@@ -149,21 +270,15 @@ def download_chirps_data(start_year: int = 2019, end_year: int = 2023) -> bool:
     logger.info(f"📋 Total files to download: {total_files}")
     logger.info(f"📁 Output directory: {output_dir.absolute()}")
     
-    # Download files
-    successful_downloads = 0
-    failed_downloads = 0
+    # Download files in parallel; the bounded worker pool caps concurrent requests to the server
+    logger.info(f"🧵 Parallel downloads: {MAX_DOWNLOAD_WORKERS} workers")
+    with create_session() as session, ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+        results = list(executor.map(
+            lambda ym: download_chirps_file(session, ym[0], ym[1], output_dir), dates
+        ))
     
-    for i, (year, month) in enumerate(dates, 1):
-        logger.info(f"\n📥 File {i}/{total_files}: {year}-{month:02d}")
-        
-        if download_chirps_file(year, month, output_dir):
-            successful_downloads += 1
-        else:
-            failed_downloads += 1
-        
-        # Rate limiting - be respectful to the server
-        if i < total_files:  # Don't sleep after the last file
-            time.sleep(1)
+    successful_downloads = sum(results)
+    failed_downloads = total_files - successful_downloads
     
     # Summary
     logger.info("\n" + "=" * 50)
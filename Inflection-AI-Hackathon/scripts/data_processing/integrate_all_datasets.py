@@ -13,44 +13,236 @@ This script integrates all datasets into a single master dataset for the Water S
 Output: Single CSV file ready for dashboard consumption
 """
 
+import os
+from pathlib import Path
+
+if __name__ == "__main__":
+    # Polars sizes its thread pool at import; when this run has CHIRPS rasters for the worker
+    # processes to decode, leave half the cores to them, otherwise keep the Polars default
+    if any(Path("data/chirps_data").glob("*.tif")):
+        os.environ.setdefault("POLARS_MAX_THREADS", str(max(1, (os.cpu_count() or 1) // 2)))
+
 import polars as pl
+import re
 import json
+import hashlib
 import logging
-from pathlib import Path
+from functools import wraps
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from itertools import repeat
 from datetime import datetime
 import rasterio
 import numpy as np
+from rasterio.transform import rowcol
 from rasterio.warp import calculate_default_transform, reproject, Resampling
+from rasterio.windows import Window
+
+# GDAL tuning for in-process reads: decompress raster blocks on all cores, give the block
+# cache 512 MB and keep PROJ from fetching remote grids; setdefault so callers can still
+# override from the shell (CHIRPS worker processes use CHIRPS_WORKER_GDAL_ENV instead)
+os.environ.setdefault("GDAL_NUM_THREADS", "ALL_CPUS")
+os.environ.setdefault("GDAL_CACHEMAX", "512")
+os.environ.setdefault("PROJ_NETWORK", "OFF")
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Approximate county bounding boxes (name, min_lat, max_lat, min_lon, max_lon) used to assign
+# soil sample points to counties; the first matching box wins, so each box appears once (counties
+# sharing an identical box with an earlier one could never be matched and are left out)
+COUNTY_BOXES = [
+    ("Mombasa", -4.5, -3.5, 39.0, 40.5),
+    ("Kwale", -4.5, -3.5, 38.0, 39.5),
+    ("Kilifi", -3.8, -2.8, 39.5, 40.5),
+    ("Tana River", -1.8, -0.8, 39.5, 40.5),
+    ("Lamu", -2.5, -1.5, 40.5, 41.5),
+    ("Taita Taveta", -3.8, -2.8, 38.0, 39.0),
+    ("Garissa", -0.8, 0.2, 39.0, 40.5),
+    ("Wajir", 1.0, 2.0, 39.5, 40.5),
+    ("Mandera", 3.0, 4.0, 41.0, 42.0),
+    ("Marsabit", 2.0, 3.0, 37.5, 38.5),
+    ("Isiolo", 0.0, 1.0, 37.0, 38.0),
+    ("Meru", 0.0, 1.0, 37.5, 38.5),
+    ("Tharaka Nithi", -0.5, 0.5, 37.5, 38.5),
+    ("Embu", -0.8, 0.2, 37.0, 38.0),
+    ("Kitui", -1.8, -0.8, 37.5, 38.5),
+    ("Machakos", -2.0, -1.0, 37.0, 38.0),
+    ("Makueni", -2.5, -1.5, 37.5, 38.5),
+    ("Nyandarua", -0.8, 0.2, 36.0, 37.0),
+    ("Nyeri", -0.8, 0.2, 36.5, 37.5),
+    ("Kirinyaga", -1.0, 0.0, 37.0, 38.0),
+    ("Kiambu", -1.5, -0.5, 36.5, 37.5),
+    ("Turkana", 3.0, 4.0, 35.0, 36.0),
+    ("West Pokot", 1.0, 2.0, 34.5, 35.5),
+    ("Samburu", 1.0, 2.0, 36.5, 37.5),
+    ("Uasin Gishu", 0.0, 1.0, 35.0, 36.0),
+    ("Nandi", 0.0, 1.0, 34.5, 35.5),
+    ("Baringo", 0.0, 1.0, 36.0, 37.0),
+    ("Nakuru", -0.8, 0.2, 35.5, 36.5),
+    ("Narok", -1.5, -0.5, 35.5, 36.5),
+    ("Kajiado", -2.0, -1.0, 36.5, 37.5),
+    ("Kericho", -0.8, 0.2, 35.0, 36.0),
+    ("Bomet", -1.0, 0.0, 35.0, 36.0),
+    ("Kakamega", 0.0, 1.0, 34.0, 35.0),
+    ("Kisumu", -0.5, 0.5, 34.0, 35.0),
+    ("Homa Bay", -1.0, 0.0, 34.0, 35.0),
+    ("Migori", -1.5, -0.5, 34.0, 35.0),
+    ("Kisii", -1.0, 0.0, 34.5, 35.5)
+]
+
+# County centroids (approximate coordinates for Kenya counties) sampled from each CHIRPS raster
+COUNTY_CENTROIDS = {
+    "Mombasa": (-4.0435, 39.6682),
+    "Kwale": (-4.1816, 39.4606),
+    "Kilifi": (-3.5107, 39.9093),
+    "Tana River": (-1.6516, 39.7596),
+    "Lamu": (-2.2711, 40.9020),
+    "Taita Taveta": (-3.3958, 38.3846),
+    "Garissa": (-0.4565, 39.6483),
+    "Wajir": (1.7473, 40.0573),
+    "Mandera": (3.9373, 41.8568),
+    "Marsabit": (2.3344, 37.9909),
+    "Isiolo": (0.3545, 37.5833),
+    "Meru": (0.0469, 37.6591),
+    "Tharaka Nithi": (-0.2965, 37.7233),
+    "Embu": (-0.5312, 37.4506),
+    "Kitui": (-1.3672, 38.0106),
+    "Machakos": (-1.5177, 37.2634),
+    "Makueni": (-2.2558, 37.8931),
+    "Nyandarua": (-0.5323, 36.6174),
+    "Nyeri": (-0.4201, 36.9476),
+    "Kirinyaga": (-0.6591, 37.3827),
+    "Murang'a": (-0.7833, 37.1333),
+    "Kiambu": (-1.0319, 36.8681),
+    "Turkana": (3.3122, 35.5658),
+    "West Pokot": (1.6219, 35.2604),
+    "Samburu": (1.2155, 36.9541),
+    "Trans Nzoia": (1.0566, 34.9533),
+    "Uasin Gishu": (0.5204, 35.2699),
+    "Elgeyo Marakwet": (0.5204, 35.2699),
+    "Nandi": (0.1833, 35.1333),
+    "Baringo": (0.4667, 36.0667),
+    "Laikipia": (0.2044, 36.2044),
+    "Nakuru": (-0.3031, 36.0800),
+    "Narok": (-1.0800, 35.8700),
+    "Kajiado": (-1.8500, 36.7833),
+    "Kericho": (-0.3667, 35.2833),
+    "Bomet": (-0.7833, 35.3500),
+    "Kakamega": (0.2833, 34.7500),
+    "Vihiga": (0.0833, 34.7167),
+    "Bungoma": (0.5667, 34.5667),
+    "Busia": (0.4667, 34.1167),
+    "Siaya": (0.0667, 34.2833),
+    "Kisumu": (-0.1000, 34.7500),
+    "Homa Bay": (-0.5167, 34.4500),
+    "Migori": (-1.0667, 34.4667),
+    "Kisii": (-0.6833, 34.7667),
+    "Nyamira": (-0.5667, 34.9500),
+    "Nairobi": (-1.2921, 36.8219)
+}
+
+# zstd level for the Parquet copy of the master dataset
+PARQUET_COMPRESSION_LEVEL = 3
+
+# Parquet checkpoints of producer outputs, keyed by their input files' paths and mtimes
+# plus a digest of this script, so edits to producers or their constants invalidate them
+CACHE_DIR = Path("data/cache")
+SCRIPT_DIGEST = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+# CHIRPS file stem date, e.g. "chirps-v3.0.2019.01" or "chirps-v3.0.201901"
+CHIRPS_DATE_RE = re.compile(r"chirps-v3\.0\.(\d{4})\.?(\d{2})")
+
+# GDAL settings for each CHIRPS worker process; the pool already spreads files across cores,
+# so every worker decodes single-threaded with a small block cache
+CHIRPS_WORKER_GDAL_ENV = {
+    "GDAL_NUM_THREADS": "1",
+    "GDAL_CACHEMAX": "64"
+}
+
+# Column schema of the county-level CHIRPS rainfall frame
+CHIRPS_SCHEMA = {
+    "County": pl.Utf8,
+    "Year": pl.Int32,
+    "Month": pl.Int8,
+    "Monthly_Rainfall_mm": pl.Float32
+}
+
+# COUNTY_BOXES as structure-of-arrays for the NumPy rectangle scan
+COUNTY_NAMES = np.array([box[0] for box in COUNTY_BOXES], dtype=object)
+COUNTY_LAT_LO, COUNTY_LAT_HI, COUNTY_LON_LO, COUNTY_LON_HI = (
+    np.array(bounds, dtype=np.float64) for bounds in zip(*(box[1:] for box in COUNTY_BOXES))
+)
+
+def assign_counties(lats, lons):
+    """County name for each lat/lon point from the first matching box, "Unknown" where none match."""
+    lats, lons = lats[:, None], lons[:, None]
+    
+    # (N_points, N_boxes) hit mask; argmax picks the first matching box per point
+    mask = ((COUNTY_LAT_LO <= lats) & (lats <= COUNTY_LAT_HI)
+            & (COUNTY_LON_LO <= lons) & (lons <= COUNTY_LON_HI))
+    return np.where(mask.any(axis=1), COUNTY_NAMES[mask.argmax(axis=1)], "Unknown")
+
+def parquet_checkpoint(*input_patterns):
+    """Cache a producer's LazyFrame as Parquet until any of its input files change."""
+    def decorator(producer):
+        @wraps(producer)
+        def wrapper():
+            input_files = sorted(path for pattern in input_patterns for path in Path().glob(pattern))
+            if not input_files:
+                return producer()
+            
+            # Key on the script digest and the sorted input paths and their mtimes, so code
+            # changes and edited or added files invalidate the cache
+            stamp = repr([SCRIPT_DIGEST, *((str(path), path.stat().st_mtime_ns) for path in input_files)])
+            key = hashlib.sha256(stamp.encode()).hexdigest()[:16]
+            cache_file = CACHE_DIR / f"{producer.__name__}_{key}.parquet"
+            
+            if cache_file.exists():
+                logger.info(f"♻️ Using cached {producer.__name__} output: {cache_file}")
+                return pl.scan_parquet(cache_file)
+            
+            result = producer()
+            if result is None:
+                return None
+            
+            # Drop checkpoints from older inputs, then write atomically via a temp file
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            for stale_file in CACHE_DIR.glob(f"{producer.__name__}_*.parquet"):
+                stale_file.unlink()
+            tmp_file = cache_file.with_suffix(".parquet.tmp")
+            result.sink_parquet(tmp_file, compression="zstd", compression_level=PARQUET_COMPRESSION_LEVEL)
+            tmp_file.replace(cache_file)
+            return pl.scan_parquet(cache_file)
+        return wrapper
+    return decorator
+
+@parquet_checkpoint("data/weather_data/weather_data_*.csv")
 def aggregate_weather_data_monthly():
-    """Aggregate hourly weather data to monthly summaries for all counties."""
+    """Aggregate hourly weather data to monthly summaries for all counties (as a LazyFrame)."""
     logger.info("🌤️ Aggregating weather data to monthly summaries...")
     
     weather_dir = Path("data/weather_data")
     weather_files = list(weather_dir.glob("weather_data_*.csv"))
     
-    all_monthly_data = []
+    # Build one lazy query per county file; projection pushdown means the CSV readers
+    # only parse the columns the monthly aggregation uses
+    queries = {}
     
     for file_path in weather_files:
         county_name = file_path.stem.replace("weather_data_", "").replace("_", " ").title()
         logger.info(f"  Processing {county_name}...")
         
-        try:
-            # Read weather data
-            df = pl.read_csv(file_path)
-            
-            # The Date column is already in date format, just convert to datetime
-            df = df.with_columns([
-                pl.col("Date").str.strptime(pl.Date, format="%Y-%m-%d").dt.year().alias("Year"),
-                pl.col("Date").str.strptime(pl.Date, format="%Y-%m-%d").dt.month().alias("Month")
+        # The Date column is already in date format; parse it once and derive Year/Month from it
+        monthly_agg = (pl.scan_csv(file_path)
+            .with_columns(pl.col("Date").str.strptime(pl.Date, format="%Y-%m-%d").alias("_date"))
+            .with_columns([
+                pl.col("_date").dt.year().alias("Year"),
+                pl.col("_date").dt.month().alias("Month")
             ])
-            
             # Monthly aggregation
-            monthly_agg = df.group_by(["Year", "Month"]).agg([
+            .group_by(["Year", "Month"]).agg([
                 pl.col("Temperature_C").mean().alias("Monthly_Temperature_C"),
                 pl.col("Humidity_Percent").mean().alias("Monthly_Humidity_Percent"),
                 pl.col("Pressure_hPa").mean().alias("Monthly_Pressure_hPa"),
@@ -61,53 +253,67 @@ def aggregate_weather_data_monthly():
                 pl.col("Crop_Yield_Impact_Percent").mean().alias("Monthly_Crop_Yield_Impact_Percent"),
                 pl.col("Heat_Stress_Days").sum().alias("Monthly_Heat_Stress_Days")
             ])
-            
             # Add county name
-            monthly_agg = monthly_agg.with_columns(pl.lit(county_name).alias("County"))
-            
-            all_monthly_data.append(monthly_agg)
-            
-        except Exception as e:
-            logger.error(f"Error processing {county_name}: {e}")
+            .with_columns(pl.lit(county_name).alias("County"))
+        )
+        
+        queries[county_name] = monthly_agg
+    
+    # Execute all county queries in parallel; if any file is malformed, fall back to
+    # collecting each county on its own so only the bad ones are skipped
+    try:
+        all_monthly_data = pl.collect_all(list(queries.values())) if queries else []
+    except Exception:
+        all_monthly_data = []
+        for county_name, query in queries.items():
+            try:
+                all_monthly_data.append(query.collect())
+            except Exception as e:
+                logger.error(f"Error processing {county_name}: {e}")
     
     # Combine all counties
     if all_monthly_data:
-        combined_weather = pl.concat(all_monthly_data)
+        # Joins and group_bys handle chunked input, so skip the extra rechunk copy
+        combined_weather = pl.concat(all_monthly_data, how="vertical_relaxed", rechunk=False)
         logger.info(f"✅ Weather data aggregated: {len(combined_weather)} records")
-        return combined_weather
+        return combined_weather.lazy() if not combined_weather.is_empty() else None
     else:
         logger.error("No weather data processed successfully")
         return None
 
+@parquet_checkpoint("data/water_scarcity_dashboard/temperature_data_real.csv",
+                    "data/water_scarcity_dashboard/irrigation_need_data_real.csv",
+                    "data/water_scarcity_dashboard/water_stress_index_data_real.csv")
 def merge_water_scarcity_dashboard_data():
-    """Merge the three water scarcity dashboard datasets."""
+    """Merge the three water scarcity dashboard datasets (as a LazyFrame)."""
     logger.info("💧 Merging water scarcity dashboard datasets...")
     
     dashboard_dir = Path("data/water_scarcity_dashboard")
     
-    # Read all three datasets
-    temperature_data = pl.read_csv(dashboard_dir / "temperature_data_real.csv")
-    irrigation_data = pl.read_csv(dashboard_dir / "irrigation_need_data_real.csv")
-    water_stress_data = pl.read_csv(dashboard_dir / "water_stress_index_data_real.csv")
-    
-    # Merge datasets on County + Year + Month
-    merged_data = temperature_data.join(
-        irrigation_data, 
-        on=["County", "Year", "Month"], 
-        how="inner",
-        suffix="_irrigation"
-    ).join(
-        water_stress_data, 
-        on=["County", "Year", "Month"], 
-        how="inner",
-        suffix="_water_stress"
+    # Scan all three datasets and merge on County + Year + Month in one lazy plan, so the
+    # optimizer picks the join build sides and only parses the columns that are kept
+    merged_data = (pl.scan_csv(dashboard_dir / "temperature_data_real.csv")
+        .join(
+            pl.scan_csv(dashboard_dir / "irrigation_need_data_real.csv"),
+            on=["County", "Year", "Month"],
+            how="inner",
+            suffix="_irrigation"
+        )
+        .join(
+            pl.scan_csv(dashboard_dir / "water_stress_index_data_real.csv"),
+            on=["County", "Year", "Month"],
+            how="inner",
+            suffix="_water_stress"
+        )
+        .collect()
     )
     
     logger.info(f"✅ Dashboard data merged: {len(merged_data)} records")
-    return merged_data
+    return merged_data.lazy() if not merged_data.is_empty() else None
 
+@parquet_checkpoint("data/processed/county_maize_yields_2019-2023.csv")
 def integrate_maize_data():
-    """Integrate county-level maize yields data."""
+    """Integrate county-level maize yields data (as a LazyFrame)."""
     logger.info("🌽 Integrating maize production data...")
     
     maize_file = Path("data/processed/county_maize_yields_2019-2023.csv")
@@ -115,36 +321,26 @@ def integrate_maize_data():
     if maize_file.exists():
         maize_data = pl.read_csv(maize_file)
         
-        # Create monthly records by duplicating annual data for each month
-        monthly_maize = []
-        
-        for row in maize_data.iter_rows(named=True):
-            county = row["County"]
-            year = row["Year"]
-            area_ha = row["Area_Ha"]
-            production_tons = row["Production_Tons"]
-            yield_tonnes_ha = row["Yield_tonnes_ha"]
-            
-            # Create 12 monthly records
-            for month in range(1, 13):
-                monthly_maize.append({
-                    "County": county,
-                    "Year": year,
-                    "Month": month,
-                    "Maize_Area_Ha": area_ha,
-                    "Maize_Production_Tons": production_tons,
-                    "Maize_Yield_tonnes_ha": yield_tonnes_ha
-                })
-        
-        maize_monthly_df = pl.DataFrame(monthly_maize)
-        logger.info(f"✅ Maize data integrated: {len(maize_monthly_df)} monthly records")
-        return maize_monthly_df
+        # Create monthly records by duplicating annual data for each month (cross join in Rust)
+        months = pl.LazyFrame({"Month": list(range(1, 13))})
+        maize_monthly_lf = (maize_data.lazy()
+            .join(months, how="cross")
+            .rename({
+                "Area_Ha": "Maize_Area_Ha",
+                "Production_Tons": "Maize_Production_Tons",
+                "Yield_tonnes_ha": "Maize_Yield_tonnes_ha"
+            })
+            .select(["County", "Year", "Month", "Maize_Area_Ha", "Maize_Production_Tons", "Maize_Yield_tonnes_ha"])
+        )
+        logger.info(f"✅ Maize data integrated: {len(maize_data) * 12} monthly records")
+        return maize_monthly_lf
     else:
         logger.warning("Maize yields file not found")
         return None
 
+@parquet_checkpoint("data/processed/kenya_soil_properties_isric.csv")
 def aggregate_soil_data_by_county():
-    """Aggregate soil properties data to county level."""
+    """Aggregate soil properties data to county level (as a LazyFrame)."""
     logger.info("🌱 Aggregating soil properties by county...")
     
     soil_file = Path("data/processed/kenya_soil_properties_isric.csv")
@@ -155,113 +351,9 @@ def aggregate_soil_data_by_county():
         # Filter for Kenya data only
         soil_data = soil_data.filter(pl.col("Country") == "KE")
         
-        # Group by geographic regions (approximate county boundaries)
-        # We'll create county assignments based on latitude/longitude ranges
-        def assign_county(lat, lon):
-            if -4.5 <= lat <= -3.5 and 39.0 <= lon <= 40.5:
-                return "Mombasa"
-            elif -4.5 <= lat <= -3.5 and 38.0 <= lon <= 39.5:
-                return "Kwale"
-            elif -3.8 <= lat <= -2.8 and 39.5 <= lon <= 40.5:
-                return "Kilifi"
-            elif -1.8 <= lat <= -0.8 and 39.5 <= lon <= 40.5:
-                return "Tana River"
-            elif -2.5 <= lat <= -1.5 and 40.5 <= lon <= 41.5:
-                return "Lamu"
-            elif -3.8 <= lat <= -2.8 and 38.0 <= lon <= 39.0:
-                return "Taita Taveta"
-            elif -0.8 <= lat <= 0.2 and 39.0 <= lon <= 40.5:
-                return "Garissa"
-            elif 1.0 <= lat <= 2.0 and 39.5 <= lon <= 40.5:
-                return "Wajir"
-            elif 3.0 <= lat <= 4.0 and 41.0 <= lon <= 42.0:
-                return "Mandera"
-            elif 2.0 <= lat <= 3.0 and 37.5 <= lon <= 38.5:
-                return "Marsabit"
-            elif 0.0 <= lat <= 1.0 and 37.0 <= lon <= 38.0:
-                return "Isiolo"
-            elif 0.0 <= lat <= 1.0 and 37.5 <= lon <= 38.5:
-                return "Meru"
-            elif -0.5 <= lat <= 0.5 and 37.5 <= lon <= 38.5:
-                return "Tharaka Nithi"
-            elif -0.8 <= lat <= 0.2 and 37.0 <= lon <= 38.0:
-                return "Embu"
-            elif -1.8 <= lat <= -0.8 and 37.5 <= lon <= 38.5:
-                return "Kitui"
-            elif -2.0 <= lat <= -1.0 and 37.0 <= lon <= 38.0:
-                return "Machakos"
-            elif -2.5 <= lat <= -1.5 and 37.5 <= lon <= 38.5:
-                return "Makueni"
-            elif -0.8 <= lat <= 0.2 and 36.0 <= lon <= 37.0:
-                return "Nyandarua"
-            elif -0.8 <= lat <= 0.2 and 36.5 <= lon <= 37.5:
-                return "Nyeri"
-            elif -1.0 <= lat <= 0.0 and 37.0 <= lon <= 38.0:
-                return "Kirinyaga"
-            elif -1.0 <= lat <= 0.0 and 37.0 <= lon <= 38.0:
-                return "Murang'a"
-            elif -1.5 <= lat <= -0.5 and 36.5 <= lon <= 37.5:
-                return "Kiambu"
-            elif 3.0 <= lat <= 4.0 and 35.0 <= lon <= 36.0:
-                return "Turkana"
-            elif 1.0 <= lat <= 2.0 and 34.5 <= lon <= 35.5:
-                return "West Pokot"
-            elif 1.0 <= lat <= 2.0 and 36.5 <= lon <= 37.5:
-                return "Samburu"
-            elif 1.0 <= lat <= 2.0 and 34.5 <= lon <= 35.5:
-                return "Trans Nzoia"
-            elif 0.0 <= lat <= 1.0 and 35.0 <= lon <= 36.0:
-                return "Uasin Gishu"
-            elif 0.0 <= lat <= 1.0 and 35.0 <= lon <= 36.0:
-                return "Elgeyo Marakwet"
-            elif 0.0 <= lat <= 1.0 and 34.5 <= lon <= 35.5:
-                return "Nandi"
-            elif 0.0 <= lat <= 1.0 and 36.0 <= lon <= 37.0:
-                return "Baringo"
-            elif 0.0 <= lat <= 1.0 and 36.0 <= lon <= 37.0:
-                return "Laikipia"
-            elif -0.8 <= lat <= 0.2 and 35.5 <= lon <= 36.5:
-                return "Nakuru"
-            elif -1.5 <= lat <= -0.5 and 35.5 <= lon <= 36.5:
-                return "Narok"
-            elif -2.0 <= lat <= -1.0 and 36.5 <= lon <= 37.5:
-                return "Kajiado"
-            elif -0.8 <= lat <= 0.2 and 35.0 <= lon <= 36.0:
-                return "Kericho"
-            elif -1.0 <= lat <= 0.0 and 35.0 <= lon <= 36.0:
-                return "Bomet"
-            elif 0.0 <= lat <= 1.0 and 34.0 <= lon <= 35.0:
-                return "Kakamega"
-            elif 0.0 <= lat <= 1.0 and 34.0 <= lon <= 35.0:
-                return "Vihiga"
-            elif 0.0 <= lat <= 1.0 and 34.0 <= lon <= 35.0:
-                return "Bungoma"
-            elif 0.0 <= lat <= 1.0 and 34.0 <= lon <= 35.0:
-                return "Busia"
-            elif 0.0 <= lat <= 1.0 and 34.0 <= lon <= 35.0:
-                return "Siaya"
-            elif -0.5 <= lat <= 0.5 and 34.0 <= lon <= 35.0:
-                return "Kisumu"
-            elif -1.0 <= lat <= 0.0 and 34.0 <= lon <= 35.0:
-                return "Homa Bay"
-            elif -1.5 <= lat <= -0.5 and 34.0 <= lon <= 35.0:
-                return "Migori"
-            elif -1.0 <= lat <= 0.0 and 34.5 <= lon <= 35.5:
-                return "Kisii"
-            elif -1.0 <= lat <= 0.0 and 34.5 <= lon <= 35.5:
-                return "Nyamira"
-            elif -1.5 <= lat <= -0.5 and 36.5 <= lon <= 37.5:
-                return "Nairobi"
-            else:
-                return "Unknown"
-        
-        # Add county assignment
-        soil_data = soil_data.with_columns([
-            pl.struct(["Latitude", "Longitude"]).map_elements(
-                lambda x: assign_county(x["Latitude"], x["Longitude"]),
-                return_dtype=pl.Utf8
-            ).alias("County")
-        ])
+        # Assign counties from approximate lat/lon boxes (NumPy rectangle scan)
+        counties = assign_counties(soil_data["Latitude"].to_numpy(), soil_data["Longitude"].to_numpy())
+        soil_data = soil_data.with_columns(pl.Series("County", counties, dtype=pl.Utf8))
         
         # Filter out unknown counties
         soil_data = soil_data.filter(pl.col("County") != "Unknown")
@@ -280,23 +372,17 @@ def aggregate_soil_data_by_county():
                 pl.col(col).mean().alias(f"Soil_{col}") for col in existing_numeric
             ])
             
-            # Create monthly records for each county (same values for all months)
-            monthly_soil = []
-            
-            for row in county_soil.iter_rows(named=True):
-                county = row["County"]
-                soil_values = {k: v for k, v in row.items() if k != "County"}
-                
-                # Create 5 years × 12 months = 60 records per county
-                for year in range(2019, 2024):
-                    for month in range(1, 13):
-                        record = {"County": county, "Year": year, "Month": month}
-                        record.update(soil_values)
-                        monthly_soil.append(record)
-            
-            soil_monthly_df = pl.DataFrame(monthly_soil)
-            logger.info(f"✅ Soil data aggregated: {len(soil_monthly_df)} monthly records")
-            return soil_monthly_df
+            # Create monthly records for each county (same values for all months):
+            # 5 years × 12 months = 60 records per county via a cross join on the Year/Month grid
+            grid = pl.LazyFrame({"Year": list(range(2019, 2024))}).join(
+                pl.LazyFrame({"Month": list(range(1, 13))}), how="cross"
+            )
+            soil_monthly_lf = (county_soil.lazy()
+                .join(grid, how="cross")
+                .select(["County", "Year", "Month", pl.exclude("County", "Year", "Month")])
+            )
+            logger.info(f"✅ Soil data aggregated: {len(county_soil) * 60} monthly records")
+            return soil_monthly_lf
         else:
             logger.warning("No numeric soil columns found")
             return None
@@ -304,8 +390,57 @@ def aggregate_soil_data_by_county():
         logger.warning("Soil properties file not found")
         return None
 
+def _init_chirps_worker():
+    """Apply the per-worker GDAL settings in a CHIRPS worker process."""
+    os.environ.update(CHIRPS_WORKER_GDAL_ENV)
+
+def _extract_chirps_file(file_path, county_centroids):
+    """Gather county centroid rainfall from a single CHIRPS GeoTIFF into a small frame."""
+    rainfall_df = pl.DataFrame(schema=CHIRPS_SCHEMA)
+    
+    # Extract year and month from filename ("2019.01" and "201901" forms) in one regex match
+    filename = file_path.stem
+    match = CHIRPS_DATE_RE.search(filename)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+        
+        if 2019 <= year <= 2023:  # Only process our target years
+            logger.info(f"  Processing {year}-{month:02d}...")
+            
+            try:
+                counties = np.array(list(county_centroids), dtype=object)
+                lats, lons = np.array(list(county_centroids.values())).T
+                
+                # Read GeoTIFF
+                with rasterio.open(file_path) as src:
+                    # Pixel indices of every centroid in one vectorized rowcol call
+                    rows, cols = (np.asarray(idx) for idx in rowcol(src.transform, lons, lats))
+                    inside = (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+                    counties, rows, cols = counties[inside], rows[inside], cols[inside]
+                    
+                    if len(counties):
+                        # Read only the window spanning the centroids, then gather all pixels at once
+                        row_off, col_off = rows.min(), cols.min()
+                        window = Window(col_off, row_off, cols.max() - col_off + 1, rows.max() - row_off + 1)
+                        rainfall = src.read(1, window=window, masked=True)[rows - row_off, cols - col_off]
+                        
+                        # Skip nodata pixels and NaNs
+                        valid = ~np.ma.getmaskarray(rainfall) & ~np.isnan(rainfall.filled(np.nan))
+                        rainfall_df = pl.DataFrame({
+                            "County": counties[valid].tolist(),
+                            "Year": year,
+                            "Month": month,
+                            "Monthly_Rainfall_mm": rainfall.data[valid]
+                        }, schema=CHIRPS_SCHEMA)
+                
+            except (ValueError, IndexError) as e:
+                logger.warning(f"Error processing {filename}: {e}")
+    
+    return rainfall_df
+
+@parquet_checkpoint("data/chirps_data/*.tif")
 def convert_chirps_to_csv():
-    """Convert CHIRPS GeoTIFF files to county-level CSV data."""
+    """Convert CHIRPS GeoTIFF files to county-level rainfall data (as a LazyFrame)."""
     logger.info("🌧️ Converting CHIRPS rainfall data to CSV...")
     
     chirps_dir = Path("data/chirps_data")
@@ -315,125 +450,52 @@ def convert_chirps_to_csv():
         logger.warning("No CHIRPS files found")
         return None
     
-    # County centroids (approximate coordinates for Kenya counties)
-    county_centroids = {
-        "Mombasa": (-4.0435, 39.6682),
-        "Kwale": (-4.1816, 39.4606),
-        "Kilifi": (-3.5107, 39.9093),
-        "Tana River": (-1.6516, 39.7596),
-        "Lamu": (-2.2711, 40.9020),
-        "Taita Taveta": (-3.3958, 38.3846),
-        "Garissa": (-0.4565, 39.6483),
-        "Wajir": (1.7473, 40.0573),
-        "Mandera": (3.9373, 41.8568),
-        "Marsabit": (2.3344, 37.9909),
-        "Isiolo": (0.3545, 37.5833),
-        "Meru": (0.0469, 37.6591),
-        "Tharaka Nithi": (-0.2965, 37.7233),
-        "Embu": (-0.5312, 37.4506),
-        "Kitui": (-1.3672, 38.0106),
-        "Machakos": (-1.5177, 37.2634),
-        "Makueni": (-2.2558, 37.8931),
-        "Nyandarua": (-0.5323, 36.6174),
-        "Nyeri": (-0.4201, 36.9476),
-        "Kirinyaga": (-0.6591, 37.3827),
-        "Murang'a": (-0.7833, 37.1333),
-        "Kiambu": (-1.0319, 36.8681),
-        "Turkana": (3.3122, 35.5658),
-        "West Pokot": (1.6219, 35.2604),
-        "Samburu": (1.2155, 36.9541),
-        "Trans Nzoia": (1.0566, 34.9533),
-        "Uasin Gishu": (0.5204, 35.2699),
-        "Elgeyo Marakwet": (0.5204, 35.2699),
-        "Nandi": (0.1833, 35.1333),
-        "Baringo": (0.4667, 36.0667),
-        "Laikipia": (0.2044, 36.2044),
-        "Nakuru": (-0.3031, 36.0800),
-        "Narok": (-1.0800, 35.8700),
-        "Kajiado": (-1.8500, 36.7833),
-        "Kericho": (-0.3667, 35.2833),
-        "Bomet": (-0.7833, 35.3500),
-        "Kakamega": (0.2833, 34.7500),
-        "Vihiga": (0.0833, 34.7167),
-        "Bungoma": (0.5667, 34.5667),
-        "Busia": (0.4667, 34.1167),
-        "Siaya": (0.0667, 34.2833),
-        "Kisumu": (-0.1000, 34.7500),
-        "Homa Bay": (-0.5167, 34.4500),
-        "Migori": (-1.0667, 34.4667),
-        "Kisii": (-0.6833, 34.7667),
-        "Nyamira": (-0.5667, 34.9500),
-        "Nairobi": (-1.2921, 36.8219)
-    }
-    
-    rainfall_data = []
+    # Decode files in parallel on the cores Polars is not using; each worker opens its own
+    # GDAL dataset. Workers are spawned rather than forked because other producer threads
+    # may be running Polars at this point
+    max_workers = max(1, (os.cpu_count() or 1) - pl.thread_pool_size())
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context("spawn"),
+                             initializer=_init_chirps_worker) as executor:
+        results = list(executor.map(_extract_chirps_file, chirps_files,
+                                    repeat(COUNTY_CENTROIDS), chunksize=2))
     
-    for file_path in chirps_files:
-        # Extract year and month from filename
-        filename = file_path.stem
-        if "chirps-v3.0." in filename:
-            date_part = filename.replace("chirps-v3.0.", "")
-            try:
-                # Handle format like "2019.01" -> year=2019, month=01
-                if "." in date_part:
-                    year_str, month_str = date_part.split(".")
-                    year = int(year_str)
-                    month = int(month_str)
-                else:
-                    # Handle format like "201901" -> year=2019, month=01
-                    year = int(date_part[:4])
-                    month = int(date_part[4:6])
-                
-                if 2019 <= year <= 2023:  # Only process our target years
-                    logger.info(f"  Processing {year}-{month:02d}...")
-                    
-                    # Read GeoTIFF
-                    with rasterio.open(file_path) as src:
-                        # Extract rainfall values for each county centroid
-                        for county, (lat, lon) in county_centroids.items():
-                            # Convert lat/lon to pixel coordinates
-                            row, col = src.index(lon, lat)
-                            
-                            # Extract rainfall value
-                            rainfall = src.read(1)[row, col]
-                            
-                            if not np.isnan(rainfall):
-                                rainfall_data.append({
-                                    "County": county,
-                                    "Year": year,
-                                    "Month": month,
-                                    "Monthly_Rainfall_mm": float(rainfall)
-                                })
-                    
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Error processing {filename}: {e}")
-                continue
+    rainfall_df = pl.concat(results)
     
-    if rainfall_data:
-        rainfall_df = pl.DataFrame(rainfall_data)
+    if not rainfall_df.is_empty():
         logger.info(f"✅ CHIRPS data converted: {len(rainfall_df)} records")
-        return rainfall_df
+        return rainfall_df.lazy()
     else:
         logger.warning("No CHIRPS data extracted")
         return None
 
 def create_master_dataset():
-    """Create the final master dataset by joining all integrated datasets."""
+    """Create the final master dataset plan by joining all integrated datasets (as a LazyFrame)."""
     logger.info("🔗 Creating master dataset...")
     
-    # Get all integrated datasets
-    weather_data = aggregate_weather_data_monthly()
-    dashboard_data = merge_water_scarcity_dashboard_data()
-    maize_data = integrate_maize_data()
-    soil_data = aggregate_soil_data_by_county()
-    rainfall_data = convert_chirps_to_csv()
+    # Get all integrated datasets; the producers are independent, so run them concurrently
+    # (their CSV parsing, Polars kernels and raster I/O release the GIL)
+    producers = {
+        "weather": aggregate_weather_data_monthly,
+        "dashboard": merge_water_scarcity_dashboard_data,
+        "maize": integrate_maize_data,
+        "soil": aggregate_soil_data_by_county,
+        "rainfall": convert_chirps_to_csv
+    }
+    with ThreadPoolExecutor(max_workers=len(producers)) as executor:
+        futures = {name: executor.submit(producer) for name, producer in producers.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    
+    weather_data = results["weather"]
+    dashboard_data = results["dashboard"]
+    maize_data = results["maize"]
+    soil_data = results["soil"]
+    rainfall_data = results["rainfall"]
     
-    if not all([weather_data is not None and not weather_data.is_empty(), 
-                 dashboard_data is not None and not dashboard_data.is_empty()]):
+    if weather_data is None or dashboard_data is None:
         logger.error("Critical datasets missing. Cannot proceed.")
         return None
     
-    # Start with weather data as base
+    # Start with weather data as base; the joins below only build one lazy plan
     master_data = weather_data
     
     # Join with dashboard data
@@ -471,36 +533,40 @@ def create_master_dataset():
             suffix="_rainfall"
         )
     
-    # Calculate composite metrics
+    # Calculate composite metrics; main() streams the whole plan to disk once
     master_data = calculate_composite_metrics(master_data)
     
-    logger.info(f"✅ Master dataset created: {len(master_data)} records")
+    # Down-cast to compact dtypes before the frame is written
+    master_data = master_data.with_columns([
+        pl.col("Year").cast(pl.Int16),
+        pl.col("Month").cast(pl.Int8),
+        pl.col(pl.Float64).cast(pl.Float32)
+    ])
+    
+    logger.info("✅ Master dataset plan created")
     return master_data
 
 def calculate_composite_metrics(df):
     """Calculate composite water scarcity and agricultural risk metrics."""
     logger.info("🧮 Calculating composite metrics...")
     
-    # Water Scarcity Score (0-100)
+    # All three scores in one with_columns so Polars evaluates them in parallel in a single pass
     df = df.with_columns([
+        # Water Scarcity Score (0-100)
         pl.when(pl.col("Monthly_Water_Stress_Index").is_null())
         .then(pl.lit(50))  # Default middle value
         .otherwise(
             pl.col("Monthly_Water_Stress_Index") * 100
-        ).alias("Water_Scarcity_Score")
-    ])
-    
-    # Agricultural Risk Index (0-100)
-    df = df.with_columns([
+        ).alias("Water_Scarcity_Score"),
+        
+        # Agricultural Risk Index (0-100)
         pl.when(pl.col("Monthly_Crop_Yield_Impact_Percent").is_null())
         .then(pl.lit(25))  # Default low risk
         .otherwise(
             pl.col("Monthly_Crop_Yield_Impact_Percent")
-        ).alias("Agricultural_Risk_Index")
-    ])
-    
-    # Irrigation Priority Score (0-100)
-    df = df.with_columns([
+        ).alias("Agricultural_Risk_Index"),
+        
+        # Irrigation Priority Score (0-100)
         pl.when(pl.col("Monthly_Irrigation_Needed_Real").is_null())
         .then(pl.lit(50))  # Default middle value
         .otherwise(
@@ -522,18 +588,32 @@ def main():
     master_dataset = create_master_dataset()
     
     if master_dataset is not None:
-        # Save master dataset
+        # Stream the master dataset to CSV and to a columnar Parquet copy for downstream readers
+        # (scan_parquet gets projection/predicate pushdown), computing the summary in the same pass
         output_file = Path("data/master_water_scarcity_dataset.csv")
-        master_dataset.write_csv(output_file)
+        parquet_file = output_file.with_suffix(".parquet")
+        _, _, stats = pl.collect_all([
+            master_dataset.sink_csv(output_file, lazy=True),
+            master_dataset.sink_parquet(parquet_file, compression="zstd",
+                                        compression_level=PARQUET_COMPRESSION_LEVEL,
+                                        statistics=True, lazy=True),
+            master_dataset.select(
+                pl.len().alias("total_records"),
+                pl.col("County").unique().implode().alias("counties"),
+                pl.col("Year").unique().sort().implode().alias("years"),
+                pl.col("Month").unique().sort().implode().alias("months")
+            )
+        ], engine="streaming")
+        stats = stats.row(0, named=True)
         
         # Generate summary statistics
         summary = {
             "timestamp": datetime.now().isoformat(),
-            "total_records": len(master_dataset),
-            "counties": master_dataset["County"].unique().to_list(),
-            "years": sorted(master_dataset["Year"].unique().to_list()),
-            "months": sorted(master_dataset["Month"].unique().to_list()),
-            "columns": master_dataset.columns,
+            "total_records": stats["total_records"],
+            "counties": stats["counties"],
+            "years": stats["years"],
+            "months": stats["months"],
+            "columns": master_dataset.collect_schema().names(),
             "file_size_mb": round(output_file.stat().st_size / (1024 * 1024), 2)
         }
         
@@ -551,14 +631,15 @@ def main():
         logger.info(f"📅 Years: {summary['years'][0]} - {summary['years'][-1]}")
         logger.info(f"📁 File Size: {summary['file_size_mb']} MB")
         logger.info(f"💾 Master Dataset: {output_file}")
+        logger.info(f"💾 Master Dataset (Parquet): {parquet_file}")
         logger.info(f"📋 Summary: {summary_file}")
         
         # Data quality check
         logger.info(f"\n🔍 Data Quality Check:")
-        logger.info(f"  Total Records: {len(master_dataset):,}")
-        logger.info(f"  Counties: {len(master_dataset['County'].unique())}")
-        logger.info(f"  Years: {master_dataset['Year'].min()} - {master_dataset['Year'].max()}")
-        logger.info(f"  Months: {master_dataset['Month'].min()} - {master_dataset['Month'].max()}")
+        logger.info(f"  Total Records: {summary['total_records']:,}")
+        logger.info(f"  Counties: {len(summary['counties'])}")
+        logger.info(f"  Years: {summary['years'][0]} - {summary['years'][-1]}")
+        logger.info(f"  Months: {summary['months'][0]} - {summary['months'][-1]}")
         
     else:
         logger.error("❌ Integration failed!")
@@ -5,10 +5,11 @@ Focuses on recovering recoverable soil properties: pH, Nitrogen, Texture, CEC
 """
 
 import polars as pl
+import polars.selectors as cs
 import pandas as pd
 import numpy as np
 from pathlib import Path
-import json
+import orjson
 import logging
 from datetime import datetime
 import warnings
@@ -18,6 +19,37 @@ warnings.filterwarnings('ignore')
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Soil properties that can be recovered (lab analysis / regional averages)
+RECOVERABLE_PROPERTIES = [
+    'pH_H2O', 'pH_KCl', 'Total_Nitrogen', 
+    'Clay', 'Sand', 'Silt', 'CEC'
+]
+
+# ISRIC columns used by the gap analysis and the regional averages
+ISRIC_COLUMNS = ['Latitude', 'Longitude', *RECOVERABLE_PROPERTIES]
+
+# Regions indexed by 2 * (Latitude < 0) + (Longitude < 36); missing coordinates fall to Coastal
+REGION_NAMES = ['Central', 'Western', 'Eastern', 'Coastal']
+
+def region_from_coordinates_expr():
+    """Branchless Region lookup from the Latitude/Longitude hemisphere bits."""
+    region_idx = ((pl.col("Latitude") < 0.0).cast(pl.UInt8) * 2
+                  + (pl.col("Longitude") < 36.0).cast(pl.UInt8)).fill_null(3)
+    return region_idx.replace_strict(list(range(len(REGION_NAMES))), REGION_NAMES,
+                                     return_dtype=pl.Utf8).alias("Region")
+
+def scan_csv_cached(csv_path):
+    """Lazily scan a CSV through a zstd Parquet copy kept next to it, rebuilt whenever the CSV is newer."""
+    csv_path = Path(csv_path)
+    parquet_path = csv_path.with_suffix('.parquet')
+    
+    if not parquet_path.exists() or parquet_path.stat().st_mtime < csv_path.stat().st_mtime:
+        tmp_path = parquet_path.with_suffix('.parquet.tmp')
+        pl.scan_csv(csv_path).sink_parquet(tmp_path, compression='zstd', statistics=True)
+        tmp_path.replace(parquet_path)
+    
+    return pl.scan_parquet(parquet_path)
+
 class SoilDataRecovery:
     """Class to handle soil data recovery strategies"""
     
@@ -33,8 +65,13 @@ class SoilDataRecovery:
         # Load ISRIC soil data
         isric_path = "data/processed/kenya_soil_properties_isric.csv"
         if Path(isric_path).exists():
-            self.isric_data = pl.read_csv(isric_path)
-            logger.info(f"✅ ISRIC data loaded: {self.isric_data.shape}")
+            # Lazy scan of only the columns we analyze (properties absent from the file are skipped);
+            # the gap analysis and regional averages then share a single pass over it
+            self.isric_data = (scan_csv_cached(isric_path)
+                               .select(cs.by_name(*ISRIC_COLUMNS, require_all=False)))
+            isric_shape = (self.isric_data.select(pl.len()).collect().item(),
+                           len(self.isric_data.collect_schema()))
+            logger.info(f"✅ ISRIC data loaded: {isric_shape}")
         else:
             logger.error(f"❌ ISRIC data not found: {isric_path}")
             return False
@@ -42,8 +79,11 @@ class SoilDataRecovery:
         # Load master dataset
         master_path = "data/processed/master_water_scarcity_dataset_realistic.csv"
         if Path(master_path).exists():
-            self.master_data = pl.read_csv(master_path)
-            logger.info(f"✅ Master data loaded: {self.master_data.shape}")
+            # No master columns are read downstream, so keep it as a lazy scan and only count rows
+            self.master_data = scan_csv_cached(master_path)
+            master_shape = (self.master_data.select(pl.len()).collect().item(),
+                            len(self.master_data.collect_schema()))
+            logger.info(f"✅ Master data loaded: {master_shape}")
         else:
             logger.error(f"❌ Master data not found: {master_path}")
             return False
@@ -54,23 +94,29 @@ class SoilDataRecovery:
         """Analyze gaps in recoverable soil properties"""
         logger.info("🔍 Analyzing recoverable soil data gaps...")
         
-        # Focus on recoverable properties
-        recoverable_properties = [
-            'pH_H2O', 'pH_KCl', 'Total_Nitrogen', 
-            'Clay', 'Sand', 'Silt', 'CEC'
-        ]
-        
         gap_analysis = {}
         
-        for prop in recoverable_properties:
-            if prop in self.isric_data.columns:
-                missing_count = self.isric_data.select(pl.col(prop).null_count()).item()
-                missing_pct = (missing_count / len(self.isric_data)) * 100
+        # Null counts, row count and regional averages from one collect_all over the shared scan;
+        # the averages are kept for implement_regional_averages
+        null_counts, total_records, regional_averages = pl.collect_all([
+            self.isric_data.null_count(),
+            self.isric_data.select(pl.len()),
+            self._regional_averages_query()
+        ], engine="streaming")
+        null_counts = null_counts.row(0, named=True)
+        total_records = total_records.item()
+        self.recovery_results['regional_averages'] = regional_averages
+        
+        # Focus on recoverable properties
+        for prop in RECOVERABLE_PROPERTIES:
+            if prop in null_counts:
+                missing_count = null_counts[prop]
+                missing_pct = (missing_count / total_records) * 100
                 
                 gap_analysis[prop] = {
                     'missing_count': missing_count,
                     'missing_percentage': missing_pct,
-                    'available_count': len(self.isric_data) - missing_count,
+                    'available_count': total_records - missing_count,
                     'recovery_potential': 'HIGH' if missing_pct < 50 else 'MEDIUM'
                 }
                 
@@ -110,13 +156,16 @@ class SoilDataRecovery:
             'CEC': 30           # USD per sample
         }
         
-        # Calculate total cost
-        total_cost = 0
-        for prop in lab_plan['properties_to_analyze']:
-            if prop in cost_per_sample:
-                prop_cost = gap_analysis[prop]['missing_count'] * cost_per_sample[prop]
-                lab_plan['estimated_costs'][prop] = prop_cost
-                total_cost += prop_cost
+        # Calculate per-property and total cost for the properties with missing samples
+        lab_df = pl.DataFrame({
+            'prop': list(cost_per_sample),
+            'cost': list(cost_per_sample.values()),
+            'missing': [gap_analysis.get(prop, {}).get('missing_count', 0) for prop in cost_per_sample]
+        }).filter(pl.col('missing') > 0).with_columns(
+            (pl.col('missing') * pl.col('cost')).alias('prop_cost')
+        )
+        lab_plan['estimated_costs'] = dict(zip(lab_df['prop'], lab_df['prop_cost']))
+        total_cost = int(lab_df['prop_cost'].sum())
         
         lab_plan['total_estimated_cost'] = total_cost
         
@@ -140,38 +189,31 @@ class SoilDataRecovery:
         """Implement regional averages for missing soil properties"""
         logger.info("🗺️ Implementing regional averages...")
         
+        # Reuse the averages computed alongside the gap analysis when available
+        regional_averages = self.recovery_results.get('regional_averages')
+        if regional_averages is None:
+            regional_averages = self._regional_averages_query().collect()
+        
+        logger.info(f"   Regional averages calculated for {len(regional_averages)} regions")
+        
+        return regional_averages
+    
+    def _regional_averages_query(self):
+        """Lazy per-region means of the recoverable soil properties"""
         # Group by geographic regions based on coordinates
         # Create geographic bins for regional analysis
-        regional_data = self.isric_data.with_columns([
-            pl.when((pl.col("Latitude") >= 0.0) & (pl.col("Longitude") >= 36.0))
-            .then(pl.lit("Central"))
-            .when((pl.col("Latitude") >= 0.0) & (pl.col("Longitude") < 36.0))
-            .then(pl.lit("Western"))
-            .when((pl.col("Latitude") < 0.0) & (pl.col("Longitude") >= 36.0))
-            .then(pl.lit("Eastern"))
-            .otherwise(pl.lit("Coastal"))
-            .alias("Region")
-        ])
-        
-        # Calculate regional averages for available data
-        regional_averages = regional_data.group_by("Region").agg([
-            pl.col('pH_H2O').mean().alias('pH_H2O_avg'),
-            pl.col('pH_KCl').mean().alias('pH_KCl_avg'),
-            pl.col('Total_Nitrogen').mean().alias('Total_Nitrogen_avg'),
-            pl.col('Clay').mean().alias('Clay_avg'),
-            pl.col('Sand').mean().alias('Sand_avg'),
-            pl.col('Silt').mean().alias('Silt_avg'),
-            pl.col('CEC').mean().alias('CEC_avg')
-        ])
+        regional_data = self.isric_data.with_columns(region_from_coordinates_expr())
         
-        # Filter out regions with no data
-        regional_averages = regional_averages.filter(
-            pl.any_horizontal(pl.col('*').is_not_null())
+        # Calculate regional averages for available data (one multi-output aggregation)
+        properties = [prop for prop in RECOVERABLE_PROPERTIES if prop in self.isric_data.collect_schema()]
+        regional_averages = regional_data.group_by("Region").agg(
+            pl.col(properties).mean().name.suffix('_avg')
         )
         
-        logger.info(f"   Regional averages calculated for {len(regional_averages)} regions")
-        
-        return regional_averages
+        # Filter out regions with no data
+        return regional_averages.filter(
+            pl.any_horizontal([pl.col(f'{prop}_avg').is_not_null() for prop in properties])
+        )
     
     def create_expert_consultation_plan(self):
         """Create expert consultation plan for soil data validation"""
@@ -218,7 +260,7 @@ class SoilDataRecovery:
             'recovery_strategy': 'Multi-pronged approach for recoverable soil data',
             'gap_analysis': gap_analysis,
             'laboratory_plan': lab_plan,
-            'regional_averages': regional_averages,
+            'regional_averages': regional_averages.to_dicts(),
             'expert_consultation': expert_plan,
             'summary': {
                 'total_properties_targeted': len(gap_analysis),
@@ -234,8 +276,8 @@ class SoilDataRecovery:
         report_path = "data/reports/soil_data_recovery_plan.json"
         Path(report_path).parent.mkdir(parents=True, exist_ok=True)
         
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        with open(report_path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         logger.info(f"   ✅ Recovery report saved to: {report_path}")
         return report
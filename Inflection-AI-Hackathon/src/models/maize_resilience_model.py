@@ -129,7 +129,9 @@ class MaizeResilienceModel:
             X, y, test_size=test_size, random_state=random_state
         )
         
-        # Scale features
+        # Scale features (models loaded from scaler-less artifacts get a fresh scaler)
+        if self.scaler is None:
+            self.scaler = StandardScaler()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
@@ -273,8 +275,8 @@ class MaizeResilienceModel:
         # Combine features
         X_combined = np.hstack([X_numerical, X_county_encoded])
         
-        # Scale features
-        X_scaled = self.scaler.transform(X_combined)
+        # Scale features (county-specific forests are saved without a scaler)
+        X_scaled = self.scaler.transform(X_combined) if self.scaler is not None else X_combined
         
         # Predict yield
         predicted_yield = self.model.predict(X_scaled)[0]